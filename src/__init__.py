@@ -1,7 +1,13 @@
 """
 Perplexity.ai automation package
 """
-from .perplexity import ask_plexi, close_browser
 
 __all__ = ['ask_plexi', 'close_browser']
 
+
+def __getattr__(name):
+    # Import lazily so the CLI entry points don't load Selenium just to parse arguments
+    if name in __all__:
+        from . import perplexity
+        return getattr(perplexity, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -2,28 +2,401 @@
 Browser management for Perplexity.ai Automation
 """
 import os
+import re
 import time
+import functools
+import concurrent.futures
 import logging
-import glob
+import json
 import shutil
 import tempfile
 import subprocess
 import signal
-import undetected_chromedriver as uc
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import InvalidSessionIdException
+import sys
+import threading
 
+from .config import get_default_user_data_dir, get_xdg_config_dir, get_xdg_data_dir
 
-def detect_chrome_binary_and_major():
-    """
-    Detect Chrome binary path and major version.
+# Cookie fields accepted by WebDriver's add_cookie()
+_COOKIE_FIELDS = {"name", "value", "domain", "path", "expiry", "secure", "httpOnly", "sameSite"}
+# How long a check_login() result is reused before the page is queried again.
+# Logged-out verdicts expire quickly so a manual login is noticed right away; logged-in
+# verdicts are kept longer but only while the browser stays on the same URL.
+_LOGIN_CHECK_TTL_SECONDS = 0.5
+_LOGGED_IN_TTL_SECONDS = 5.0
+
+# True if any element matching the XPath is rendered (each XPath is compiled once per script)
+_ANY_VISIBLE_JS = """
+var compiledXPaths = {};
+function anyVisible(xpath) {
+    var expr = compiledXPaths[xpath] || (compiledXPaths[xpath] = document.createExpression(xpath, null));
+    var nodes = expr.evaluate(document, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+    for (var i = 0; i < nodes.snapshotLength; i++) {
+        var el = nodes.snapshotItem(i);
+        if (el.offsetWidth || el.offsetHeight || el.getClientRects().length) {
+            return true;
+        }
+    }
+    return false;
+}
+"""
+
+# Cloudflare interstitial indicators, checked in the page instead of serializing page_source
+_CLOUDFLARE_PROBE_JS = """
+if (/Just a moment/.test(document.title) || document.getElementById('challenge-stage')) {
+    return true;
+}
+var hint = document.evaluate(
+    "//*[contains(text(), 'Before continuing, we need to be sure you are human')]",
+    document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null
+);
+return hint.singleNodeValue !== null;
+"""
+
+# Input.dispatchMouseEvent fields shared by press/release of a single left click
+_CDP_LEFT_BUTTON = {"button": "left", "buttons": 1, "clickCount": 1}
+
+# Turnstile widget selectors (the checkbox lives inside the iframe)
+_TURNSTILE_IFRAME_CSS = "iframe[src*='challenges.cloudflare.com']"
+_TURNSTILE_CHECKBOX_CSS = "input[type='checkbox']"
+
+# True once the Turnstile widget iframe has fired its load event. Iframe resource
+# timing entries are only recorded at load, which also works for cross-origin frames.
+_TURNSTILE_LOADED_JS = """
+return performance.getEntriesByType('resource').some(function(entry) {
+    return entry.initiatorType === 'iframe' && entry.name.indexOf('challenges.cloudflare.com') !== -1;
+});
+"""
+
+# Subsystems Perplexity's page doesn't need; skipped for headless (server) browsers.
+# GPU stays enabled unless browser.disable_gpu is set: a software-only WebGL renderer
+# is a common bot signal. Site isolation is left on.
+_HEADLESS_CHROME_FLAGS = (
+    "--disable-extensions",
+    "--disable-background-networking",
+    "--disable-background-timer-throttling",
+    "--disable-backgrounding-occluded-windows",
+    "--disable-renderer-backgrounding",
+    "--disable-breakpad",
+    "--disable-client-side-phishing-detection",
+    "--disable-component-update",
+    "--disable-domain-reliability",
+    "--disable-hang-monitor",
+    "--disable-ipc-flooding-protection",
+    "--disable-prompt-on-repost",
+    "--disable-sync",
+    "--disable-default-apps",
+    "--disable-translate",
+    "--metrics-recording-only",
+    "--no-pings",
+    "--mute-audio",
+    "--force-color-profile=srgb",
+    "--disable-dev-shm-usage",
+    # Chrome only honours the last --disable-features, so keep them in one flag
+    "--disable-features=Translate,TranslateUI,MediaRouter,OptimizationHints,AudioServiceOutOfProcess",
+)
+
+# Login indicators evaluated in the page. Async: polls in-page until Account or
+# Sign In renders (or arguments[0] ms pass), so the wait costs one round-trip.
+_LOGIN_PROBE_JS = _ANY_VISIBLE_JS + """
+var timeoutMs = arguments[0];
+var callback = arguments[arguments.length - 1];
+var deadline = Date.now() + timeoutMs;
+(function poll() {
+    var state = {
+        account: anyVisible("//div[contains(text(), 'Account')]"),
+        signIn: anyVisible("//div[contains(text(), 'Sign In')] | //button[contains(text(), 'Sign In')]"),
+        url: location.href
+    };
+    if (state.account || state.signIn || Date.now() >= deadline) {
+        state.accountText = !state.account && !state.signIn && anyVisible("//*[contains(text(), 'Account')]");
+        callback(state);
+        return;
+    }
+    setTimeout(poll, 100);
+})();
+"""
+
+# Login check, question entry and submit in one async script (used for the post-login warmup)
+_LOGIN_AND_WARMUP_JS = _ANY_VISIBLE_JS + """
+var prompt = arguments[0];
+var callback = arguments[arguments.length - 1];
+var result = {loggedIn: anyVisible("//div[contains(text(), 'Account')]"), inputFound: false, submitted: false};
+var input = result.loggedIn ? document.querySelector("p[dir='auto']") : null;
+if (!input) {
+    callback(result);
+    return;
+}
+result.inputFound = true;
+input.focus();
+input.click();
+input.textContent = prompt;
+['input', 'change', 'keyup', 'keydown', 'keypress'].forEach(function(eventType) {
+    input.dispatchEvent(new Event(eventType, { bubbles: true, cancelable: true }));
+});
+// The submit button only enables once the page has processed the input events
+var deadline = Date.now() + 5000;
+(function trySubmit() {
+    var button = document.querySelector("button[data-testid='submit-button'], button[aria-label='Submit']");
+    if (button && !button.disabled) {
+        button.click();
+        result.submitted = true;
+        callback(result);
+    } else if (Date.now() > deadline) {
+        callback(result);
+    } else {
+        setTimeout(trySubmit, 100);
+    }
+})();
+"""
+
+
+# Anti-detection overrides registered in every new document (visible and headless)
+_STEALTH_JS = """
+// Override navigator.webdriver (critical for detection)
+Object.defineProperty(navigator, 'webdriver', {
+    get: () => undefined
+});
+
+// Override chrome runtime (make it look like real Chrome)
+if (!window.chrome) {
+    window.chrome = {};
+}
+if (!window.chrome.runtime) {
+    window.chrome.runtime = {};
+}
+
+// WebGL fingerprinting fix - make it look like real hardware
+const getParameter = WebGLRenderingContext.prototype.getParameter;
+WebGLRenderingContext.prototype.getParameter = function(parameter) {
+    if (parameter === 37445) return 'Intel Inc.';  // UNMASKED_VENDOR_WEBGL
+    if (parameter === 37446) return 'Intel Iris OpenGL Engine';  // UNMASKED_RENDERER_WEBGL
+    return getParameter.call(this, parameter);
+};
+
+// Also fix WebGL2
+if (typeof WebGL2RenderingContext !== 'undefined') {
+    const getParameter2 = WebGL2RenderingContext.prototype.getParameter;
+    WebGL2RenderingContext.prototype.getParameter = function(parameter) {
+        if (parameter === 37445) return 'Intel Inc.';
+        if (parameter === 37446) return 'Intel Iris OpenGL Engine';
+        return getParameter2.call(this, parameter);
+    };
+}
+
+// Fix plugins array
+Object.defineProperty(navigator, 'plugins', {
+    get: () => [1, 2, 3, 4, 5]
+});
+
+// Fix languages
+Object.defineProperty(navigator, 'languages', {
+    get: () => ['en-US', 'en']
+});
+
+// Override permissions API
+const originalQuery = window.navigator.permissions.query;
+window.navigator.permissions.query = (parameters) => (
+    parameters.name === 'notifications' ?
+        Promise.resolve({ state: Notification.permission }) :
+        originalQuery(parameters)
+);
+
+// Remove automation indicators
+delete navigator.__proto__.webdriver;
+"""
+
+# Navigator/screen values a headless browser would otherwise report unrealistically
+_NAV_PROPS_JS = """
+// Set realistic navigator properties
+Object.defineProperty(navigator, 'platform', {
+    get: () => 'Linux x86_64'
+});
+
+Object.defineProperty(navigator, 'hardwareConcurrency', {
+    get: () => 8
+});
+
+Object.defineProperty(navigator, 'deviceMemory', {
+    get: () => 8
+});
+
+Object.defineProperty(navigator, 'maxTouchPoints', {
+    get: () => 0
+});
+
+// Add realistic screen properties
+Object.defineProperty(screen, 'width', {
+    get: () => 1920
+});
+
+Object.defineProperty(screen, 'height', {
+    get: () => 1080
+});
+
+Object.defineProperty(screen, 'availWidth', {
+    get: () => 1920
+});
+
+Object.defineProperty(screen, 'availHeight', {
+    get: () => 1080
+});
+
+// Override notification permission
+Object.defineProperty(Notification, 'permission', {
+    get: () => 'default'
+});
+"""
+
+# Key of the recorder's read-and-reset accessor. A Symbol-keyed, non-enumerable
+# property keeps the recorder's state out of the page's view of window.
+_CLICK_RECORDER_KEY_JS = "Symbol.for('askplexi.clickRecorder')"
+
+# Records the viewport coordinates of the user's manual Turnstile click (visible mode).
+# Runs at document start, so the iframe observer waits for <body>.
+_CLICK_RECORDER_JS = """
+(function() {
+    var key = """ + _CLICK_RECORDER_KEY_JS + """;
+    if (window !== window.top || window[key]) {
+        return;
+    }
     
-    Returns:
-        Tuple of (binary_path, major_version)
-    """
-    candidates = [
+    // Last recorded click as [x, y], handed out (and cleared) by the accessor
+    var lastClick = null;
+    Object.defineProperty(window, key, {
+        value: function() {
+            var click = lastClick;
+            lastClick = null;
+            return click;
+        }
+    });
+    
+    var observer = null;
+    function stopObserving() {
+        if (observer) {
+            observer.disconnect();
+            observer = null;
+        }
+    }
+    
+    function recordClick(x, y) {
+        lastClick = [x, y];
+        stopObserving();
+    }
+    
+    // Capture clicks on document (including iframes). Coordinates are viewport-relative,
+    // which is what Input.dispatchMouseEvent expects when they are replayed.
+    function captureClick(e) {
+        recordClick(e.clientX, e.clientY);
+    }
+    
+    // Add listeners to document and all iframes
+    document.addEventListener('click', captureClick, true);
+    document.addEventListener('mousedown', captureClick, true);
+    
+    // Also try to capture clicks in iframes (each iframe is only tried once)
+    var seenIframes = new WeakSet();
+    function watchIframes() {
+        document.querySelectorAll('iframe').forEach(function(iframe) {
+            if (seenIframes.has(iframe)) {
+                return;
+            }
+            seenIframes.add(iframe);
+            if ((iframe.src || '').indexOf('challenges.cloudflare.com') !== -1) {
+                // Found the widget; clicks on it reach the document listeners
+                stopObserving();
+            }
+            try {
+                iframe.contentWindow.addEventListener('click', function(e) {
+                    // Read at click time: the frame may have moved since it was wired
+                    var rect = iframe.getBoundingClientRect();
+                    recordClick(rect.left + e.clientX, rect.top + e.clientY);
+                }, true);
+            } catch(e) {
+                // Cross-origin iframe, can't access
+            }
+        });
+    }
+    
+    // Monitor for new iframes, rescanning at most once per animation frame
+    var scanPending = false;
+    function scheduleScan() {
+        if (scanPending) {
+            return;
+        }
+        scanPending = true;
+        requestAnimationFrame(function() {
+            scanPending = false;
+            if (observer) {
+                watchIframes();
+            }
+        });
+    }
+    // On the challenge interstitial only its container changes; elsewhere (Perplexity's
+    // streaming chat) the body-wide observer is only kept for the first 30 seconds
+    function observeIframes() {
+        var root = document.querySelector('#challenge-stage, .cf-turnstile') || document.body;
+        observer = new MutationObserver(scheduleScan);
+        observer.observe(root, { childList: true, subtree: true });
+        if (root === document.body) {
+            setTimeout(stopObserving, 30000);
+        }
+        watchIframes();
+    }
+    if (document.body) {
+        observeIframes();
+    } else {
+        document.addEventListener('DOMContentLoaded', observeIframes);
+    }
+})();
+"""
+
+# Returns [challenged, click]: the Cloudflare probe result plus the [x, y] click recorded
+# by _CLICK_RECORDER_JS since the last poll (null if none), so each click is reported once
+_MANUAL_BYPASS_POLL_JS = "var challenged = (function() {" + _CLOUDFLARE_PROBE_JS + """})();
+var takeClick = window[""" + _CLICK_RECORDER_KEY_JS + """];
+return [challenged, takeClick ? takeClick() : null];
+"""
+
+# Report clipboard access as granted; headless Chrome has no permission prompt to answer
+_HEADLESS_CLIPBOARD_JS = """
+navigator.permissions.query = (parameters) => {
+    if (parameters.name === 'clipboard-read' || parameters.name === 'clipboard-write') {
+        return Promise.resolve({ state: 'granted' });
+    }
+    return Promise.resolve({ state: 'prompt' });
+};
+"""
+
+# Everything headless browsers need, installed as a single new-document script
+_HEADLESS_STEALTH_JS = _HEADLESS_CLIPBOARD_JS + _STEALTH_JS + _NAV_PROPS_JS
+
+
+# Identifies Chrome processes in /proc/<pid>/cmdline
+_CHROME_CMDLINE_RE = re.compile(rb"chrom(e|ium)", re.IGNORECASE)
+
+# Background launches share one thread: undetected_chromedriver patches a shared
+# chromedriver binary, so concurrent uc.Chrome() calls would race on it
+_LAUNCH_EXECUTOR = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix="browser-launch")
+
+
+# Chrome/Chromium locations probed per platform, in priority order
+if sys.platform == "darwin":
+    _CHROME_CANDIDATES = (
+        "/Applications/Google Chrome.app/Contents/MacOS/Google Chrome",
+        "/Applications/Chromium.app/Contents/MacOS/Chromium",
+        "google-chrome",
+        "chromium",
+    )
+elif sys.platform == "win32":
+    _CHROME_CANDIDATES = (
+        os.path.join(os.environ.get("PROGRAMFILES", r"C:\Program Files"), r"Google\Chrome\Application\chrome.exe"),
+        os.path.join(os.environ.get("PROGRAMFILES(X86)", r"C:\Program Files (x86)"), r"Google\Chrome\Application\chrome.exe"),
+        os.path.join(os.environ.get("LOCALAPPDATA", ""), r"Google\Chrome\Application\chrome.exe"),
+        "chrome.exe",
+    )
+else:
+    _CHROME_CANDIDATES = (
         "/usr/bin/google-chrome",
         "/usr/bin/chromium",
         "/usr/bin/chromium-browser",
@@ -31,35 +404,264 @@ def detect_chrome_binary_and_major():
         "google-chrome-stable",
         "chromium",
         "chromium-browser",
-    ]
-    binary = next((p for p in candidates if shutil.which(p)), None)
-    major = None
+    )
+
+
+# One Xvfb display is shared by every browser in the process, ref-counted per manager
+_SHARED_DISPLAY = None
+_SHARED_DISPLAY_REFS = 0
+_SHARED_DISPLAY_LOCK = threading.Lock()
+
+
+def _acquire_shared_display(xvfb_class):
+    """
+    Return the process-wide Xvfb display, starting it for the first user
+    
+    Args:
+        xvfb_class: xvfbwrapper.Xvfb (imported by the caller)
+        
+    Returns:
+        The running Xvfb instance; DISPLAY is set for child processes
+    """
+    global _SHARED_DISPLAY, _SHARED_DISPLAY_REFS
+    with _SHARED_DISPLAY_LOCK:
+        if _SHARED_DISPLAY is None:
+            display = xvfb_class(width=1920, height=1080)
+            display.start()
+            _SHARED_DISPLAY = display
+            logging.info("Started Xvfb virtual display")
+        _SHARED_DISPLAY_REFS += 1
+        return _SHARED_DISPLAY
+
+
+def _release_shared_display():
+    """Drop one reference to the shared Xvfb display, stopping it with the last one"""
+    global _SHARED_DISPLAY, _SHARED_DISPLAY_REFS
+    with _SHARED_DISPLAY_LOCK:
+        if _SHARED_DISPLAY_REFS == 0:
+            return
+        _SHARED_DISPLAY_REFS -= 1
+        if _SHARED_DISPLAY_REFS or _SHARED_DISPLAY is None:
+            return
+        try:
+            _SHARED_DISPLAY.stop()
+            logging.info("Stopped Xvfb virtual display")
+        except Exception as e:
+            logging.debug(f"Failed to stop Xvfb: {e}")
+        _SHARED_DISPLAY = None
+
+
+_GOLDEN_PROFILE_LOCK = threading.Lock()
+
+
+def _golden_profile_dir():
+    """
+    Return a first-run-initialized profile to seed ephemeral profiles from, building it once
+    
+    The template is created by a throwaway headless Chrome run so ephemeral launches
+    skip Chrome's first-run profile population. It never holds cookies or logins.
+    
+    Returns:
+        Path to the template profile, or None if it could not be built
+    """
+    golden = os.path.join(get_xdg_data_dir(), "ephemeral-profile-template")
+    with _GOLDEN_PROFILE_LOCK:
+        if os.path.isfile(os.path.join(golden, "Local State")):
+            return golden
+        
+        binary, _ = detect_chrome_binary_and_major()
+        if not binary:
+            return None
+        building = golden + ".tmp"
+        shutil.rmtree(building, ignore_errors=True)
+        try:
+            os.makedirs(os.path.dirname(golden), exist_ok=True)
+            subprocess.run(
+                [
+                    binary,
+                    f"--user-data-dir={building}",
+                    "--headless=new",
+                    "--no-first-run",
+                    "--no-default-browser-check",
+                    "--dump-dom",
+                    *(["--no-sandbox"] if _sandbox_unavailable() else []),
+                    "about:blank",
+                ],
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                timeout=30,
+                check=True,
+            )
+            shutil.rmtree(golden, ignore_errors=True)
+            os.replace(building, golden)
+        except Exception as e:
+            logging.debug(f"Could not build ephemeral profile template: {e}")
+            shutil.rmtree(building, ignore_errors=True)
+            return None
+        logging.info(f"Built ephemeral profile template at {golden}")
+        return golden
+
+
+def _seed_profile(template, user_data_dir):
+    """
+    Copy template into the (empty) user_data_dir
+    
+    Uses copy-on-write clones (cp --reflink=auto) where the filesystem supports them
+    and falls back to a regular copy.
+    """
+    try:
+        subprocess.run(
+            ["cp", "-a", "--reflink=auto", f"{template}/.", user_data_dir],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        shutil.copytree(template, user_data_dir, symlinks=True, dirs_exist_ok=True)
+
+
+def _sandbox_unavailable():
+    """Return True when Chrome's sandbox can't work: running as root or inside a container"""
+    geteuid = getattr(os, "geteuid", None)
+    if geteuid is not None and geteuid() == 0:
+        return True
+    return os.path.exists("/.dockerenv") or os.path.exists("/run/.containerenv")
+
+
+def _windows_registry_chrome():
+    """Return chrome.exe from the Windows 'App Paths' registry key, if registered"""
+    try:
+        import winreg
+    except ImportError:
+        return None
+    subkey = r"SOFTWARE\Microsoft\Windows\CurrentVersion\App Paths\chrome.exe"
+    for hive in (winreg.HKEY_CURRENT_USER, winreg.HKEY_LOCAL_MACHINE):
+        try:
+            with winreg.OpenKey(hive, subkey) as key:
+                path = winreg.QueryValue(key, None)
+        except OSError:
+            continue
+        if path and os.path.isfile(path):
+            return path
+    return None
+
+
+def _is_executable(path):
+    """Return True if path is an executable file"""
+    return os.path.isfile(path) and os.access(path, os.X_OK)
+
+
+def _chrome_detection_file():
+    """Return the file where the last Chrome detection is remembered across processes"""
+    return os.path.join(get_xdg_data_dir(), "chrome-detection.json")
+
+
+def _load_chrome_detection():
+    """
+    Return the (binary, major) saved by an earlier process
+    
+    Returns:
+        Tuple of (binary_path, major_version), or None if nothing was saved or the
+        binary was replaced (e.g. Chrome updated) since
+    """
     try:
-        cmd = binary or "google-chrome"
-        out = subprocess.check_output([cmd, "--version"], text=True).strip()
-        for token in out.split():
-            if token and token[0].isdigit():
-                major = int(token.split(".")[0])
-                break
-    except Exception:
+        with open(_chrome_detection_file(), 'r') as f:
+            saved = json.load(f)
+        binary = saved['binary']
+        if _is_executable(binary) and os.stat(binary).st_mtime_ns == saved['mtime_ns']:
+            return binary, saved.get('major')
+    except (OSError, ValueError, KeyError, TypeError):
         pass
+    return None
+
+
+def _save_chrome_detection(binary, major):
+    """Remember a detection result, keyed by the binary's mtime"""
+    path = _chrome_detection_file()
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(tmp_path, 'w') as f:
+            json.dump({'binary': binary, 'mtime_ns': os.stat(binary).st_mtime_ns, 'major': major}, f)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        logging.debug(f"Could not save Chrome detection: {e}")
+
+
+@functools.lru_cache(maxsize=1)
+def detect_chrome_binary_and_major(use_saved: bool = True):
+    """
+    Detect Chrome binary path and major version.
+    
+    $CHROME_BIN, if set, is used instead of searching for a binary. The result is cached
+    for the lifetime of the process and saved for later processes (until the binary
+    changes); call detect_chrome_binary_and_major.cache_clear() and pass use_saved=False
+    to force a re-detection.
+    
+    Args:
+        use_saved: Reuse the result saved by an earlier process if still valid
+    
+    Returns:
+        Tuple of (binary_path, major_version)
+    """
+    env_binary = os.environ.get("CHROME_BIN")
+    if use_saved:
+        saved = _load_chrome_detection()
+        if saved and (not env_binary or saved[0] == env_binary):
+            return saved
+    
+    binary = None
+    if env_binary and _is_executable(env_binary):
+        binary = env_binary
+    elif sys.platform == "win32":
+        binary = _windows_registry_chrome()
+    binary = binary or next((p for p in _CHROME_CANDIDATES if shutil.which(p)), None)
+    major = None
+    # chrome.exe --version opens a browser window instead of printing;
+    # on Windows undetected_chromedriver detects the version itself
+    if sys.platform != "win32":
+        try:
+            cmd = binary or "google-chrome"
+            out = subprocess.check_output([cmd, "--version"], text=True).strip()
+            for token in out.split():
+                if token and token[0].isdigit():
+                    major = int(token.split(".")[0])
+                    break
+        except Exception:
+            pass
+    if binary:
+        _save_chrome_detection(binary, major)
     return binary, major
 
 
 class BrowserManager:
     """Manages browser interactions for Perplexity.ai automation"""
     
-    def __init__(self, config):
+    def __init__(self, config, user_data_dir=None):
         """
         Initialize the browser manager
         
         Args:
             config: Configuration object
+            user_data_dir (str, optional): Profile directory overriding browser.user_data_dir
         """
         self.config = config
+        self.user_data_dir = user_data_dir
         self.driver = None
+        # Number of requests served since the browser was (re)started, used by BrowserPool
+        self.use_count = 0
         self._ephemeral_dir = None
         self.vdisplay = None
+        # Only one login check may talk to the driver at a time
+        self._login_check_lock = threading.Lock()
+        # (timestamp, url, result) of the last login check
+        self._last_login_check = None
+        # URL the most recent login probe ran on
+        self._last_probe_url = None
+        # Pending start_headless_browser_async() launch, if any
+        self._start_future = None
+        # Whether _CLICK_RECORDER_JS runs on every page of the current browser
+        self._click_recorder_installed = False
         
     def start_headless_browser(self, use_ephemeral: bool = False):
         """
@@ -74,13 +676,74 @@ class BrowserManager:
             return self._start_browser_with_xvfb(use_ephemeral=use_ephemeral)
         return self._start_browser(headless=True, use_ephemeral=use_ephemeral)
     
-    def start_visible_browser(self, use_ephemeral: bool = False):
+    def start_headless_browser_async(self, use_ephemeral: bool = False) -> concurrent.futures.Future:
+        """
+        Start the headless browser on a background thread
+        
+        The launch, first navigation and Cloudflare check run in the background;
+        call wait_until_started() before using the driver.
+        
+        Returns:
+            Future resolving to the WebDriver instance
+        """
+        if self._start_future is None:
+            self._start_future = _LAUNCH_EXECUTOR.submit(self.start_headless_browser, use_ephemeral)
+        return self._start_future
+    
+    def wait_until_started(self, timeout=None):
+        """
+        Block until a pending background launch has finished
+        
+        Args:
+            timeout: Seconds to wait (None waits forever)
+            
+        Returns:
+            webdriver: The running WebDriver, or None if no browser is running
+            
+        Raises:
+            Exception: Whatever the background launch raised
+        """
+        future = self._start_future
+        if future is None:
+            return self.driver
+        try:
+            return future.result(timeout)
+        finally:
+            if future.done():
+                self._start_future = None
+    
+    def wait_until_page_ready(self, timeout=None):
+        """
+        Wait for the current page to finish loading instead of sleeping a fixed time
+        
+        Args:
+            timeout: Upper bound in seconds (default: browser_load_wait_seconds, or 5)
+            
+        Returns:
+            bool: True if document.readyState reached 'complete' in time
+        """
+        if self.driver is None:
+            return False
+        if timeout is None:
+            timeout = self.config.get('browser', 'browser_load_wait_seconds') or 5
+        return self._wait_for(
+            lambda: self.driver.execute_script("return document.readyState") == "complete",
+            timeout,
+            poll=0.05,
+        )
+    
+    def start_visible_browser(self, use_ephemeral: bool = False, manual_login: bool = False):
         """
         Start a visible Chromium/Chrome browser (non-headless) and navigate to Perplexity.ai.
 
         Primarily used for manual login flows so the user can complete authentication.
+        
+        Args:
+            use_ephemeral: Launch on a throwaway profile
+            manual_login: The user is about to log in by hand; don't restore saved cookies,
+                so a stale saved session can't pass for a fresh login
         """
-        return self._start_browser(headless=False, use_ephemeral=use_ephemeral)
+        return self._start_browser(headless=False, use_ephemeral=use_ephemeral, manual_login=manual_login)
     
     def _start_browser_with_xvfb(self, use_ephemeral: bool = False):
         """Start browser in headed mode using Xvfb virtual display"""
@@ -91,11 +754,9 @@ class BrowserManager:
             logging.warning("Falling back to regular headless mode")
             return self._start_browser(headless=True, use_ephemeral=use_ephemeral)
         
-        # Start virtual display
+        # Start (or join) the shared virtual display
         try:
-            self.vdisplay = Xvfb(width=1920, height=1080)
-            self.vdisplay.start()
-            logging.info("Started Xvfb virtual display")
+            self.vdisplay = _acquire_shared_display(Xvfb)
         except Exception as e:
             logging.error(f"Failed to start Xvfb: {e}")
             logging.warning("Falling back to regular headless mode")
@@ -108,22 +769,35 @@ class BrowserManager:
         except Exception as e:
             # Clean up virtual display on error
             if self.vdisplay is not None:
-                try:
-                    self.vdisplay.stop()
-                    self.vdisplay = None
-                except Exception:
-                    pass
+                self.vdisplay = None
+                _release_shared_display()
             raise e
     
-    def _start_browser(self, headless: bool = True, use_ephemeral: bool = False):
+    def _start_browser(self, headless: bool = True, use_ephemeral: bool = False, manual_login: bool = False):
         """Shared browser launch routine using undetected_chromedriver."""
+        # Imported here: undetected_chromedriver patches chromedriver and pulls in
+        # selenium, which code paths that never launch a browser shouldn't pay for
+        import undetected_chromedriver as uc
+        
         perplexity_url = self.config.get('browser', 'perplexity_url')
         
         if use_ephemeral:
             user_data_dir = tempfile.mkdtemp(prefix="perplexity-ephemeral-")
             self._ephemeral_dir = user_data_dir
+            template = _golden_profile_dir()
+            if template:
+                try:
+                    _seed_profile(template, user_data_dir)
+                    self._clear_profile_singleton_locks(user_data_dir)
+                except Exception as e:
+                    logging.debug(f"Could not seed ephemeral profile, starting empty: {e}")
         else:
-            user_data_dir = os.path.expanduser(self.config.get('browser', 'user_data_dir'))
+            # Always reuse a stable profile so Chromium keeps its caches between launches
+            user_data_dir = os.path.expanduser(
+                self.user_data_dir
+                or self.config.get('browser', 'user_data_dir')
+                or get_default_user_data_dir()
+            )
             os.makedirs(user_data_dir, exist_ok=True)
 
         chrome_binary, major = detect_chrome_binary_and_major()
@@ -142,6 +816,13 @@ class BrowserManager:
             # Set realistic window size
             options.add_argument("--window-size=1920,1080")
         
+        # Server browsers (headless or on Xvfb) skip unused subsystems to start faster and use less memory
+        if headless or self.vdisplay is not None:
+            for flag in _HEADLESS_CHROME_FLAGS:
+                options.add_argument(flag)
+            if self.config.get('browser', 'disable_gpu'):
+                options.add_argument("--disable-gpu")
+        
         # Disable password manager and save password prompts
         prefs = {
             "credentials_enable_service": False,
@@ -162,82 +843,35 @@ class BrowserManager:
             uc_kwargs["version_main"] = major
         if chrome_binary:
             uc_kwargs["browser_executable_path"] = chrome_binary
+        # undetected_chromedriver disables the sandbox by default; only do that where
+        # Chrome can't sandbox itself (running as root, or inside a container)
+        no_sandbox = self.config.get('browser', 'no_sandbox')
+        if no_sandbox is None:
+            no_sandbox = _sandbox_unavailable()
+        uc_kwargs["no_sandbox"] = bool(no_sandbox)
 
         def _launch():
             try:
                 self.driver = uc.Chrome(**uc_kwargs)
+                # Set saved cookies before the first navigation so no reload is needed;
+                # fall back to add_cookie() + refresh if CDP is unavailable
+                restore_cookies = not manual_login
+                restored_via_cdp = restore_cookies and self._restore_cookies_via_cdp()
+                # Stealth overrides must be in place before the first document loads,
+                # otherwise Cloudflare fingerprints the unpatched navigator
+                stealth_installed = self._install_stealth_scripts(headless, click_recorder=manual_login)
                 self.driver.get(perplexity_url)
+                self._invalidate_login_check()
+                if restore_cookies and not restored_via_cdp and self._restore_cookies():
+                    self.driver.refresh()
                 mode = "Headless" if headless else "Visible"
                 logging.info("%s Chromium/Chrome started and navigated to Perplexity.ai", mode)
                 
-                # DON'T use CDP in headless mode - it's detectable
-                # Only use CDP in visible mode (restore original behavior that worked)
-                if not headless:
-                    try:
-                        # Comprehensive anti-detection script injection via CDP (visible mode only)
-                        # Original approach: inject after navigation (this worked before)
-                        self.driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {
-                            'source': '''
-                                // Override navigator.webdriver (critical for detection)
-                                Object.defineProperty(navigator, 'webdriver', {
-                                    get: () => undefined
-                                });
-                                
-                                // Override chrome runtime (make it look like real Chrome)
-                                if (!window.chrome) {
-                                    window.chrome = {};
-                                }
-                                if (!window.chrome.runtime) {
-                                    window.chrome.runtime = {};
-                                }
-                                
-                                // WebGL fingerprinting fix - make it look like real hardware
-                                const getParameter = WebGLRenderingContext.prototype.getParameter;
-                                WebGLRenderingContext.prototype.getParameter = function(parameter) {
-                                    if (parameter === 37445) return 'Intel Inc.';  // UNMASKED_VENDOR_WEBGL
-                                    if (parameter === 37446) return 'Intel Iris OpenGL Engine';  // UNMASKED_RENDERER_WEBGL
-                                    return getParameter.call(this, parameter);
-                                };
-                                
-                                // Also fix WebGL2
-                                if (typeof WebGL2RenderingContext !== 'undefined') {
-                                    const getParameter2 = WebGL2RenderingContext.prototype.getParameter;
-                                    WebGL2RenderingContext.prototype.getParameter = function(parameter) {
-                                        if (parameter === 37445) return 'Intel Inc.';
-                                        if (parameter === 37446) return 'Intel Iris OpenGL Engine';
-                                        return getParameter2.call(this, parameter);
-                                    };
-                                }
-                                
-                                // Fix plugins array
-                                Object.defineProperty(navigator, 'plugins', {
-                                    get: () => [1, 2, 3, 4, 5]
-                                });
-                                
-                                // Fix languages
-                                Object.defineProperty(navigator, 'languages', {
-                                    get: () => ['en-US', 'en']
-                                });
-                                
-                                // Override permissions API
-                                const originalQuery = window.navigator.permissions.query;
-                                window.navigator.permissions.query = (parameters) => (
-                                    parameters.name === 'notifications' ?
-                                        Promise.resolve({ state: Notification.permission }) :
-                                        originalQuery(parameters)
-                                );
-                                
-                                // Remove automation indicators
-                                delete navigator.__proto__.webdriver;
-                            '''
-                        })
-                        logging.debug("Anti-detection scripts injected via CDP (visible mode)")
-                    except Exception as e:
-                        logging.debug(f"Could not inject anti-detection scripts via CDP: {e}")
+                if not stealth_installed and headless:
+                    self._inject_stealth_scripts_post_load()
                 
-                # Grant clipboard permissions
+                # Grant clipboard permissions (headless mode reports them via _HEADLESS_CLIPBOARD_JS)
                 if not headless:
-                    # Use CDP in visible mode (preferred)
                     try:
                         self.driver.execute_cdp_cmd('Browser.grantPermissions', {
                             'origin': perplexity_url.split('?')[0],
@@ -249,29 +883,8 @@ class BrowserManager:
                             self.driver.set_permissions("clipboard-write", "granted")
                         except Exception as e:
                             logging.debug(f"Could not set clipboard permissions: {e}")
-                else:
-                    # In headless mode, use execute_script instead of CDP
-                    try:
-                        self.driver.execute_script("""
-                            navigator.permissions.query = (parameters) => {
-                                if (parameters.name === 'clipboard-read' || parameters.name === 'clipboard-write') {
-                                    return Promise.resolve({ state: 'granted' });
-                                }
-                                return Promise.resolve({ state: 'prompt' });
-                            };
-                        """)
-                    except Exception as e:
-                        logging.debug(f"Permission override failed in headless: {e}")
-                
-                # Inject stealth scripts AFTER page load in headless mode only (no CDP)
-                # Visible mode uses CDP above (original working approach)
-                if headless:
-                    self._inject_stealth_scripts_post_load()
-                    self._add_realistic_navigator_properties()
-                    # Skip human behavior on initial load - it can interfere
                 
-                # Wait a bit and check for Cloudflare (reduced from 3 to 1 second for faster startup)
-                time.sleep(1)
+                # Check for Cloudflare (the interstitial is the document get() loaded)
                 if self._check_cloudflare_challenge():
                     logging.info("Cloudflare challenge detected, attempting bypass...")
                     self._bypass_cloudflare()
@@ -283,126 +896,59 @@ class BrowserManager:
                 chrome_unreachable_error = "cannot connect to chrome" in message or "chrome not reachable" in message
                 if (lock_related_error or chrome_unreachable_error) and not use_ephemeral:
                     logging.warning("Chrome launch failed (%s). Forcing profile cleanup and retrying...", message.splitlines()[0])
-                    self._kill_profile_chrome_processes(user_data_dir)
+                    # Terminated Chrome processes drop their lock on exit; with none running
+                    # (e.g. after a crash) the lock is stale and is cleared right away
+                    if self._kill_profile_chrome_processes(user_data_dir):
+                        self._wait_lock_released(user_data_dir, timeout=2.0)
                     self._clear_profile_singleton_locks(user_data_dir)
-                    time.sleep(1)
                     return _launch()
+                if "only supports chrome version" in message:
+                    # Chrome was upgraded since the cached detection; re-detect once
+                    detect_chrome_binary_and_major.cache_clear()
+                    _, fresh_major = detect_chrome_binary_and_major(use_saved=False)
+                    if fresh_major and fresh_major != uc_kwargs.get("version_main"):
+                        logging.warning("Chrome version changed to %s since startup, retrying launch", fresh_major)
+                        uc_kwargs["version_main"] = fresh_major
+                        return _launch()
                 raise
 
         return _launch()
     
-    def _inject_stealth_scripts_post_load(self):
-        """Inject anti-detection scripts AFTER page load without CDP (for headless mode)"""
-        if self.driver is None:
-            return
+    def _install_stealth_scripts(self, headless: bool, click_recorder: bool = False) -> bool:
+        """
+        Register the anti-detection scripts to run before any page script in every new document
         
+        Args:
+            headless: Whether the browser is headless (adds clipboard and navigator overrides)
+            click_recorder: Also register the Turnstile click recorder (visible manual-login browser)
+            
+        Returns:
+            True if the script was registered via CDP
+        """
+        source = _HEADLESS_STEALTH_JS if headless else _STEALTH_JS
+        click_recorder = click_recorder and not headless
+        if click_recorder:
+            source += _CLICK_RECORDER_JS
         try:
-            self.driver.execute_script("""
-                // Override navigator.webdriver (critical for detection)
-                Object.defineProperty(navigator, 'webdriver', {
-                    get: () => undefined
-                });
-                
-                // Override chrome runtime (make it look like real Chrome)
-                if (!window.chrome) {
-                    window.chrome = {};
-                }
-                if (!window.chrome.runtime) {
-                    window.chrome.runtime = {};
-                }
-                
-                // WebGL fingerprinting fix - make it look like real hardware
-                const getParameter = WebGLRenderingContext.prototype.getParameter;
-                WebGLRenderingContext.prototype.getParameter = function(parameter) {
-                    if (parameter === 37445) return 'Intel Inc.';  // UNMASKED_VENDOR_WEBGL
-                    if (parameter === 37446) return 'Intel Iris OpenGL Engine';  // UNMASKED_RENDERER_WEBGL
-                    return getParameter.call(this, parameter);
-                };
-                
-                // Also fix WebGL2
-                if (typeof WebGL2RenderingContext !== 'undefined') {
-                    const getParameter2 = WebGL2RenderingContext.prototype.getParameter;
-                    WebGL2RenderingContext.prototype.getParameter = function(parameter) {
-                        if (parameter === 37445) return 'Intel Inc.';
-                        if (parameter === 37446) return 'Intel Iris OpenGL Engine';
-                        return getParameter2.call(this, parameter);
-                    };
-                }
-                
-                // Fix plugins array
-                Object.defineProperty(navigator, 'plugins', {
-                    get: () => [1, 2, 3, 4, 5]
-                });
-                
-                // Fix languages
-                Object.defineProperty(navigator, 'languages', {
-                    get: () => ['en-US', 'en']
-                });
-                
-                // Override permissions API
-                const originalQuery = window.navigator.permissions.query;
-                window.navigator.permissions.query = (parameters) => (
-                    parameters.name === 'notifications' ?
-                        Promise.resolve({ state: Notification.permission }) :
-                        originalQuery(parameters)
-                );
-                
-                // Remove automation indicators
-                delete navigator.__proto__.webdriver;
-            """)
-            logging.debug("Anti-detection scripts injected via execute_script (headless mode)")
+            self.driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {'source': source})
+            logging.debug("Anti-detection scripts registered via CDP")
+            self._click_recorder_installed = click_recorder
+            return True
         except Exception as e:
-            logging.debug(f"Script injection failed in headless mode: {e}")
+            logging.debug(f"Could not register anti-detection scripts via CDP: {e}")
+            self._click_recorder_installed = False
+            return False
     
-    def _add_realistic_navigator_properties(self):
-        """Add realistic navigator and screen properties for headless mode"""
+    def _inject_stealth_scripts_post_load(self):
+        """Fallback for when CDP is unavailable: inject the headless scripts into the loaded page"""
         if self.driver is None:
             return
         
         try:
-            self.driver.execute_script("""
-                // Set realistic navigator properties
-                Object.defineProperty(navigator, 'platform', {
-                    get: () => 'Linux x86_64'
-                });
-                
-                Object.defineProperty(navigator, 'hardwareConcurrency', {
-                    get: () => 8
-                });
-                
-                Object.defineProperty(navigator, 'deviceMemory', {
-                    get: () => 8
-                });
-                
-                Object.defineProperty(navigator, 'maxTouchPoints', {
-                    get: () => 0
-                });
-                
-                // Add realistic screen properties
-                Object.defineProperty(screen, 'width', {
-                    get: () => 1920
-                });
-                
-                Object.defineProperty(screen, 'height', {
-                    get: () => 1080
-                });
-                
-                Object.defineProperty(screen, 'availWidth', {
-                    get: () => 1920
-                });
-                
-                Object.defineProperty(screen, 'availHeight', {
-                    get: () => 1080
-                });
-                
-                // Override notification permission
-                Object.defineProperty(Notification, 'permission', {
-                    get: () => 'default'
-                });
-            """)
-            logging.debug("Realistic navigator properties added")
+            self.driver.execute_script(_HEADLESS_STEALTH_JS)
+            logging.debug("Anti-detection scripts injected via execute_script (headless mode)")
         except Exception as e:
-            logging.debug(f"Failed to add realistic navigator properties: {e}")
+            logging.debug(f"Script injection failed in headless mode: {e}")
     
     def _add_human_behavior(self):
         """Add random delays and mouse movements to appear more human"""
@@ -469,18 +1015,9 @@ class BrowserManager:
             return False
         
         try:
-            # Check for Cloudflare challenge indicators
-            page_source = self.driver.page_source.lower()
-            if "just a moment" in page_source or "cloudflare" in page_source:
-                # Also check for specific Cloudflare elements
-                if self.driver.find_elements(By.XPATH, "//title[contains(text(), 'Just a moment')]"):
-                    return True
-                if self.driver.find_elements(By.XPATH, "//*[contains(text(), 'Before continuing, we need to be sure you are human')]"):
-                    return True
+            return bool(self.driver.execute_script(_CLOUDFLARE_PROBE_JS))
         except Exception:
-            pass
-        
-        return False
+            return False
     
     def _bypass_cloudflare(self, timeout: int = 120) -> bool:
         """
@@ -494,24 +1031,30 @@ class BrowserManager:
             return False
         
         logging.info("⏳ Attempting Cloudflare Turnstile bypass...")
-        time.sleep(5)  # Wait for widget to fully load
+        
+        def success_check():
+            try:
+                return not self._check_cloudflare_challenge()
+            except Exception:
+                return False
+        
+        # Wait for the widget to load (or the challenge to clear on its own)
+        self._wait_for(
+            lambda: success_check() or self.driver.execute_script(_TURNSTILE_LOADED_JS),
+            timeout=5,
+        )
         
         # Get viewport center
         try:
-            viewport_width = self.driver.execute_script("return window.innerWidth;")
-            viewport_height = self.driver.execute_script("return window.innerHeight;")
+            viewport_width, viewport_height = self.driver.execute_script(
+                "return [window.innerWidth, window.innerHeight];"
+            )
             cx = viewport_width / 2
             cy = viewport_height / 2
         except Exception:
             return False
         
         # Check if already bypassed
-        def success_check():
-            try:
-                return not self._check_cloudflare_challenge()
-            except Exception:
-                return False
-        
         if success_check():
             logging.info("✓ Turnstile already bypassed!")
             return True
@@ -521,18 +1064,23 @@ class BrowserManager:
         # Try ActionChains first (works in both modes, more realistic)
         try:
             from selenium.webdriver.common.action_chains import ActionChains
+            from selenium.webdriver.common.by import By
+            from selenium.webdriver.support import expected_conditions as EC
+            from selenium.webdriver.support.ui import WebDriverWait
+            
+            wait = WebDriverWait(self.driver, 10, poll_frequency=0.1)
             
             # Wait for iframe
-            iframe = WebDriverWait(self.driver, 10).until(
-                EC.presence_of_element_located((By.CSS_SELECTOR, "iframe[src*='challenges.cloudflare.com']"))
+            iframe = wait.until(
+                EC.presence_of_element_located((By.CSS_SELECTOR, _TURNSTILE_IFRAME_CSS))
             )
             
             # Switch to iframe
             self.driver.switch_to.frame(iframe)
             
             # Find and click the checkbox
-            checkbox = WebDriverWait(self.driver, 10).until(
-                EC.element_to_be_clickable((By.CSS_SELECTOR, "input[type='checkbox']"))
+            checkbox = wait.until(
+                EC.element_to_be_clickable((By.CSS_SELECTOR, _TURNSTILE_CHECKBOX_CSS))
             )
             
             # Use ActionChains for more realistic clicking
@@ -542,8 +1090,7 @@ class BrowserManager:
             # Switch back
             self.driver.switch_to.default_content()
             
-            time.sleep(3)
-            if success_check():
+            if self._wait_for(success_check, timeout=3):
                 logging.info("✓ Turnstile bypassed with ActionChains!")
                 return True
         except Exception as e:
@@ -561,191 +1108,160 @@ class BrowserManager:
             if saved_coords:
                 logging.info(f"Using saved click coordinates: ({saved_coords['x']}, {saved_coords['y']})")
                 try:
-                    self.driver.execute_cdp_cmd("Input.dispatchMouseEvent", {
-                        "type": "mouseMoved",
-                        "x": float(saved_coords['x']),
-                        "y": float(saved_coords['y'])
-                    })
-                    self.driver.execute_cdp_cmd("Input.dispatchMouseEvent", {
-                        "type": "mousePressed",
-                        "x": float(saved_coords['x']),
-                        "y": float(saved_coords['y']),
-                        "button": "left",
-                        "buttons": 1,
-                        "clickCount": 1
-                    })
-                    self.driver.execute_cdp_cmd("Input.dispatchMouseEvent", {
-                        "type": "mouseReleased",
-                        "x": float(saved_coords['x']),
-                        "y": float(saved_coords['y']),
-                        "button": "left",
-                        "buttons": 1,
-                        "clickCount": 1
-                    })
-                    time.sleep(2)
-                    if success_check():
+                    self._cdp_click(saved_coords['x'], saved_coords['y'])
+                    if self._wait_for(success_check, timeout=2):
                         logging.info("✓ Turnstile bypassed using saved coordinates!")
                         return True
                 except Exception as e:
                     logging.debug(f"Saved coordinates failed: {e}")
             
+            # Click the checkbox where the page says it is
+            checkbox_point = self._locate_turnstile_checkbox()
+            if checkbox_point:
+                logging.info(f"🖱️  Clicking Turnstile checkbox at ({checkbox_point[0]:.0f}, {checkbox_point[1]:.0f})")
+                try:
+                    self._cdp_click(*checkbox_point)
+                    if self._wait_for(success_check, timeout=3):
+                        logging.info("✓ Turnstile bypassed by clicking the located checkbox!")
+                        return True
+                except Exception as e:
+                    logging.debug(f"Located checkbox click failed: {e}")
+            
             # Try clicks at multiple vertical offsets from center (original approach)
             offsets_percent = [0.02, 0.04, 0.06, 0.08, 0.10]
+            targets = [(offset_pct, float(cy + viewport_height * offset_pct)) for offset_pct in offsets_percent]
             
-            for offset_pct in offsets_percent:
-                if success_check():
-                    logging.info("✓ Turnstile bypassed!")
-                    return True
-                
-                click_y = cy + (viewport_height * offset_pct)
+            # Each failed attempt below already ends with a negative success check
+            if success_check():
+                logging.info("✓ Turnstile bypassed!")
+                return True
+            
+            for offset_pct, click_y in targets:
                 logging.info(f"🖱️  Clicking at offset {offset_pct*100:.0f}%: ({cx:.0f}, {click_y:.0f})")
                 
                 # CDP click (only in visible mode)
                 try:
-                    self.driver.execute_cdp_cmd("Input.dispatchMouseEvent", {
-                        "type": "mouseMoved",
-                        "x": float(cx),
-                        "y": float(click_y)
-                    })
-                    self.driver.execute_cdp_cmd("Input.dispatchMouseEvent", {
-                        "type": "mousePressed",
-                        "x": float(cx),
-                        "y": float(click_y),
-                        "button": "left",
-                        "buttons": 1,
-                        "clickCount": 1
-                    })
-                    self.driver.execute_cdp_cmd("Input.dispatchMouseEvent", {
-                        "type": "mouseReleased",
-                        "x": float(cx),
-                        "y": float(click_y),
-                        "button": "left",
-                        "buttons": 1,
-                        "clickCount": 1
-                    })
+                    self._cdp_click(cx, click_y)
                     logging.info("✓ Click executed")
                 except Exception:
                     pass
                 
                 # Wait and check if success
-                for check in range(3):
-                    if success_check():
-                        logging.info(f"✓ Turnstile bypassed at {offset_pct*100:.0f}% offset!")
-                        return True
-                    time.sleep(0.5)
+                if self._wait_for(success_check, timeout=1.5):
+                    logging.info(f"✓ Turnstile bypassed at {offset_pct*100:.0f}% offset!")
+                    return True
         
         # If automated click fails, check if we're in visible mode for manual intervention
-        headless = self.config.get('browser', 'headless') or False
         if not headless:
             logging.info("⚠️ Auto-clicks didn't work - please click Turnstile manually...")
             logging.info("📝 Recording your click coordinates for future headless use...")
             
-            # Inject comprehensive JavaScript to record clicks (including iframe clicks)
-            self.driver.execute_script("""
-                // Initialize click tracking
-                window._lastClickX = null;
-                window._lastClickY = null;
-                window._clickRecorded = false;
-                
-                // Record click function
-                window._recordClick = function(x, y) {
-                    window._lastClickX = x;
-                    window._lastClickY = y;
-                    window._clickRecorded = true;
-                    console.log('Click recorded at:', x, y);
-                };
-                
-                // Capture clicks on document (including iframes)
-                function captureClick(e) {
-                    // Get page coordinates (not just viewport)
-                    var x = e.pageX || (e.clientX + window.scrollX);
-                    var y = e.pageY || (e.clientY + window.scrollY);
-                    window._recordClick(x, y);
-                }
-                
-                // Add listeners to document and all iframes
-                document.addEventListener('click', captureClick, true);
-                document.addEventListener('mousedown', captureClick, true);
-                
-                // Also try to capture clicks in iframes
-                var iframes = document.querySelectorAll('iframe');
-                iframes.forEach(function(iframe) {
-                    try {
-                        iframe.contentWindow.addEventListener('click', function(e) {
-                            var rect = iframe.getBoundingClientRect();
-                            var x = rect.left + e.clientX + window.scrollX;
-                            var y = rect.top + e.clientY + window.scrollY;
-                            window._recordClick(x, y);
-                        }, true);
-                    } catch(e) {
-                        // Cross-origin iframe, can't access
-                    }
-                });
-                
-                // Monitor for new iframes
-                var observer = new MutationObserver(function(mutations) {
-                    var iframes = document.querySelectorAll('iframe');
-                    iframes.forEach(function(iframe) {
-                        try {
-                            iframe.contentWindow.addEventListener('click', function(e) {
-                                var rect = iframe.getBoundingClientRect();
-                                var x = rect.left + e.clientX + window.scrollX;
-                                var y = rect.top + e.clientY + window.scrollY;
-                                window._recordClick(x, y);
-                            }, true);
-                        } catch(e) {
-                            // Cross-origin iframe, can't access
-                        }
-                    });
-                });
-                observer.observe(document.body, { childList: true, subtree: true });
-            """)
+            # The recorder is registered at launch only for the manual-login browser;
+            # otherwise inject it into the current page now
+            if not self._click_recorder_installed:
+                self.driver.execute_script(_CLICK_RECORDER_JS)
             
+            # One round-trip per poll: challenge state plus any click recorded since the last one.
+            # Most manual solves happen within seconds, so the poll backs off to 2s after that.
             timeout_manual = time.time() + timeout
-            last_click_check = time.time()
+            delay = 0.2
             while time.time() < timeout_manual:
-                # Check for recorded clicks periodically (not just after success)
-                if time.time() - last_click_check > 0.5:
-                    try:
-                        click_x = self.driver.execute_script("return window._lastClickX;")
-                        click_y = self.driver.execute_script("return window._lastClickY;")
-                        click_recorded = self.driver.execute_script("return window._clickRecorded;")
-                        
-                        if click_recorded and click_x is not None and click_y is not None:
-                            logging.info(f"📝 Recorded manual click at: ({click_x}, {click_y})")
-                            self._save_click_coords(click_x, click_y)
-                            # Reset to avoid logging multiple times
-                            self.driver.execute_script("window._clickRecorded = false;")
-                    except Exception as e:
-                        logging.debug(f"Error checking click coordinates: {e}")
-                    last_click_check = time.time()
+                try:
+                    challenged, click = self.driver.execute_script(_MANUAL_BYPASS_POLL_JS)
+                except Exception as e:
+                    logging.debug(f"Error polling manual Turnstile bypass: {e}")
+                    challenged, click = True, None
                 
-                if success_check():
-                    # Final check for click coordinates before returning
-                    try:
-                        click_x = self.driver.execute_script("return window._lastClickX;")
-                        click_y = self.driver.execute_script("return window._lastClickY;")
-                        if click_x is not None and click_y is not None:
-                            logging.info(f"📝 Final recorded click at: ({click_x}, {click_y})")
-                            self._save_click_coords(click_x, click_y)
-                    except Exception:
-                        pass
+                if click:
+                    click_x, click_y = click
+                    logging.info(f"📝 Recorded manual click at: ({click_x}, {click_y})")
+                    self._save_click_coords(click_x, click_y)
+                
+                if not challenged:
                     logging.info("✓ Turnstile bypassed (manual click)!")
                     return True
-                time.sleep(0.2)  # Check more frequently
+                time.sleep(delay)
+                delay = min(delay * 1.5, 2.0)
         else:
             # Headless mode - just wait a bit more
             logging.info("⚠️ Auto-clicks didn't work in headless mode")
-            time.sleep(5)
-            if success_check():
+            if self._wait_for(success_check, timeout=5):
                 return True
         
         return False
     
+    def _locate_turnstile_checkbox(self):
+        """
+        Find the Turnstile checkbox centre in top-level viewport coordinates
+        
+        Returns:
+            (x, y) tuple, or None if the widget or its checkbox can't be located
+        """
+        from selenium.webdriver.common.by import By
+        
+        try:
+            iframes = self.driver.find_elements(By.CSS_SELECTOR, _TURNSTILE_IFRAME_CSS)
+            if not iframes:
+                return None
+            iframe = iframes[0]
+            frame_rect = self.driver.execute_script(
+                "var r = arguments[0].getBoundingClientRect(); return [r.left, r.top];", iframe
+            )
+            self.driver.switch_to.frame(iframe)
+            try:
+                box = self.driver.execute_script(
+                    "var el = document.querySelector(arguments[0]);"
+                    "if (!el) { return null; }"
+                    "var r = el.getBoundingClientRect();"
+                    "return [r.left + r.width / 2, r.top + r.height / 2];",
+                    _TURNSTILE_CHECKBOX_CSS,
+                )
+            finally:
+                self.driver.switch_to.default_content()
+        except Exception as e:
+            logging.debug(f"Could not locate Turnstile checkbox: {e}")
+            return None
+        if not box:
+            return None
+        return frame_rect[0] + box[0], frame_rect[1] + box[1]
+    
+    def _wait_for(self, predicate, timeout, poll=0.1):
+        """
+        Poll predicate until it returns a truthy value or timeout elapses
+        
+        Args:
+            predicate: Zero-argument callable; exceptions count as False
+            timeout: Maximum seconds to wait
+            poll: Longest interval between checks; the first checks come every 25ms
+                and back off towards it, so quick conditions return quickly
+            
+        Returns:
+            bool: Whether predicate succeeded before the timeout
+        """
+        deadline = time.monotonic() + timeout
+        delay = min(0.025, poll)
+        while True:
+            try:
+                if predicate():
+                    return True
+            except Exception:
+                pass
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            time.sleep(min(delay, remaining))
+            delay = min(delay * 1.5, poll)
+    
+    def _cdp_click(self, x, y):
+        """Move to and left-click the viewport position (x, y) with CDP mouse events"""
+        point = {"x": float(x), "y": float(y)}
+        self.driver.execute_cdp_cmd("Input.dispatchMouseEvent", {"type": "mouseMoved", **point})
+        self.driver.execute_cdp_cmd("Input.dispatchMouseEvent", {"type": "mousePressed", **point, **_CDP_LEFT_BUTTON})
+        self.driver.execute_cdp_cmd("Input.dispatchMouseEvent", {"type": "mouseReleased", **point, **_CDP_LEFT_BUTTON})
+    
     def _save_click_coords(self, x, y):
         """Save click coordinates to config file"""
         try:
-            import json
             coords_file = os.path.expanduser("~/.perplexity-click-coords.json")
             with open(coords_file, 'w') as f:
                 json.dump({'x': float(x), 'y': float(y)}, f)
@@ -756,7 +1272,6 @@ class BrowserManager:
     def _load_saved_click_coords(self):
         """Load saved click coordinates"""
         try:
-            import json
             coords_file = os.path.expanduser("~/.perplexity-click-coords.json")
             if os.path.exists(coords_file):
                 with open(coords_file, 'r') as f:
@@ -765,91 +1280,266 @@ class BrowserManager:
             pass
         return None
         
-    def check_login(self):
+    def _cookies_path(self):
+        """Return the path of the persisted session cookie file"""
+        path = self.config.get('browser', 'cookies_file')
+        if path:
+            return os.path.expanduser(path)
+        return os.path.join(get_xdg_config_dir(), "cookies.json")
+
+    def save_cookies(self):
         """
-        Check if the user is logged in to Perplexity.ai
+        Persist the current Perplexity.ai cookies to disk
+        
+        The file is written owner-only and moved into place atomically, so a
+        crash mid-write never leaves a truncated cookie jar. Cookies without an
+        expiry are kept as session cookies.
         
         Returns:
-            bool: True if logged in, False otherwise
+            bool: True if cookies were written, False otherwise
         """
         if self.driver is None:
-            logging.error("Cannot check login: Browser not started")
+            return False
+        
+        path = self._cookies_path()
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            cookies = self.driver.get_cookies()
+            fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+            with os.fdopen(fd, 'w') as f:
+                json.dump(cookies, f, indent=2)
+            os.replace(tmp_path, path)
+            logging.info(f"Saved {len(cookies)} cookies to {path}")
+            return True
+        except Exception as e:
+            logging.warning(f"Failed to save cookies: {e}")
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
             return False
 
-        logging.debug("Checking login status...")
+    def session_cookie_expiry(self):
+        """
+        Return the expiry timestamp of the Perplexity session cookie in the live browser
         
-        # Check for login by looking for "Account" div (indicates logged in)
-        # If not logged in, there's a "Sign In" button instead
+        Returns:
+            Optional[float]: Earliest expiry of the session-token cookies, None if unknown
+        """
+        if self.driver is None:
+            return None
+        try:
+            cookies = self.driver.get_cookies()
+        except Exception as e:
+            logging.debug(f"Could not read cookies: {e}")
+            return None
+        expiries = [c['expiry'] for c in cookies if 'session-token' in c.get('name', '') and c.get('expiry')]
+        return min(expiries) if expiries else None
+
+    def session_token(self):
+        """
+        Return the value of the Perplexity session-token cookie in the live browser
         
-        # Try multiple XPath patterns for Account
-        account_xpaths = [
-            "//div[contains(@class, 'gap-xs') and contains(text(), 'Account')]",
-            "//div[contains(text(), 'Account')]",
-            "//div[@class='gap-xs group flex w-full cursor-pointer flex-col items-center']//div[contains(text(), 'Account')]",
-        ]
+        Cheaper than check_login(): one WebDriver call and no waiting for the page to render.
+        The cookie is httpOnly, so it can't be read from document.cookie.
         
-        for xpath in account_xpaths:
-            try:
-                logging.debug(f"Trying Account XPath: {xpath}")
-                account_div = WebDriverWait(self.driver, 2).until(
-                    EC.presence_of_element_located((By.XPATH, xpath))
-                )
-                if account_div:
-                    is_displayed = account_div.is_displayed()
-                    text = account_div.text
-                    logging.debug(f"Found Account element: displayed={is_displayed}, text='{text}'")
-                    if is_displayed:
-                        logging.info("User is logged in to Perplexity.ai (Account div found)")
-                        return True
-            except Exception as e:
-                logging.debug(f"Account XPath '{xpath}' failed: {type(e).__name__}")
-                continue
+        Returns:
+            Optional[str]: Cookie value, None if there is no session cookie
+        """
+        if self.driver is None:
+            return None
+        try:
+            cookies = self.driver.get_cookies()
+        except Exception as e:
+            logging.debug(f"Could not read cookies: {e}")
+            return None
+        for cookie in cookies:
+            if 'session-token' in cookie.get('name', ''):
+                return cookie.get('value')
+        return None
+
+    def has_saved_cookies(self):
+        """Return True if a persisted cookie file exists"""
+        return os.path.exists(self._cookies_path())
+
+    def _load_saved_cookies(self):
+        """Return the persisted, unexpired cookies (empty list if there are none)"""
+        path = self._cookies_path()
+        if not os.path.exists(path):
+            return []
+        
+        try:
+            with open(path, 'r') as f:
+                cookies = json.load(f)
+        except Exception as e:
+            logging.warning(f"Failed to read cookies from {path}: {e}")
+            return []
+        
+        now = time.time()
+        return [c for c in cookies if not (c.get('expiry') and c['expiry'] < now)]
 
-        # Check for "Sign In" button - this indicates NOT logged in
-        sign_in_xpaths = [
-            "//div[contains(text(), 'Sign In')]",
-            "//button[contains(text(), 'Sign In')]",
-        ]
+    def _restore_cookies_via_cdp(self):
+        """
+        Set persisted cookies through CDP Network.setCookies
+        
+        Works before any navigation, so the first page load is already authenticated.
         
-        for xpath in sign_in_xpaths:
+        Returns:
+            bool: True if cookies were restored, False otherwise
+        """
+        if self.driver is None:
+            return False
+        cookies = self._load_saved_cookies()
+        if not cookies:
+            return False
+        
+        cdp_cookies = []
+        for cookie in cookies:
+            cdp_cookie = {k: v for k, v in cookie.items() if k in _COOKIE_FIELDS and k != 'expiry'}
+            if cookie.get('expiry'):
+                cdp_cookie['expires'] = cookie['expiry']
+            cdp_cookies.append(cdp_cookie)
+        try:
+            self.driver.execute_cdp_cmd('Network.setCookies', {'cookies': cdp_cookies})
+        except Exception as e:
+            logging.debug(f"Could not restore cookies via CDP: {e}")
+            return False
+        logging.info(f"Restored {len(cdp_cookies)} cookies from {self._cookies_path()}")
+        return True
+
+    def _restore_cookies(self):
+        """
+        Load persisted cookies into the current browser session
+        
+        Must be called while the driver is on a Perplexity.ai page.
+        
+        Returns:
+            bool: True if at least one cookie was restored, False otherwise
+        """
+        if self.driver is None:
+            return False
+        
+        restored = 0
+        for cookie in self._load_saved_cookies():
             try:
-                logging.debug(f"Trying Sign In XPath: {xpath}")
-                sign_in_button = self.driver.find_element(By.XPATH, xpath)
-                if sign_in_button:
-                    is_displayed = sign_in_button.is_displayed()
-                    text = sign_in_button.text
-                    logging.debug(f"Found Sign In element: displayed={is_displayed}, text='{text}'")
-                    if is_displayed:
-                        logging.info("User is not logged in to Perplexity.ai (Sign In button found)")
-                        return False
+                self.driver.add_cookie({k: v for k, v in cookie.items() if k in _COOKIE_FIELDS})
+                restored += 1
             except Exception as e:
-                logging.debug(f"Sign In XPath '{xpath}' failed: {type(e).__name__}")
-                continue
+                logging.debug(f"Could not restore cookie {cookie.get('name')}: {e}")
+        if restored:
+            logging.info(f"Restored {restored} cookies from {self._cookies_path()}")
+        return restored > 0
 
-        # Try to find any text containing "Account" in the page
-        try:
-            logging.debug("Searching page source for 'Account' text...")
-            page_source = self.driver.page_source
-            if "Account" in page_source:
-                logging.debug("Found 'Account' in page source, but element not found via XPath")
-                # Try to find all divs with Account text
-                all_account_divs = self.driver.find_elements(By.XPATH, "//*[contains(text(), 'Account')]")
-                logging.debug(f"Found {len(all_account_divs)} elements containing 'Account' text")
-                for idx, div in enumerate(all_account_divs):
+    def check_login(self):
+        """
+        Check if the user is logged in to Perplexity.ai
+        
+        Returns:
+            bool: True if logged in, False otherwise
+        """
+        if self.driver is None:
+            logging.error("Cannot check login: Browser not started")
+            return False
+
+        # Serialize polls so slow Selenium round-trips don't pile up on the driver
+        with self._login_check_lock:
+            if self._last_login_check is not None:
+                checked_at, url, result = self._last_login_check
+                age = time.time() - checked_at
+                if age < _LOGIN_CHECK_TTL_SECONDS:
+                    return result
+                if result and age < _LOGGED_IN_TTL_SECONDS:
                     try:
-                        logging.debug(f"  Element {idx}: tag={div.tag_name}, displayed={div.is_displayed()}, text='{div.text[:50]}'")
-                        if div.is_displayed() and "Account" in div.text:
-                            logging.info("User is logged in to Perplexity.ai (Account text found in visible element)")
-                            return True
+                        if self.driver.current_url == url:
+                            return result
                     except Exception:
                         pass
+            self._last_probe_url = None
+            result = self._check_login()
+            self._last_login_check = (time.time(), self._last_probe_url, result)
+            return result
+
+    def last_login_state(self, max_age=None):
+        """
+        Return the most recent check_login() result without probing the page
+        
+        Args:
+            max_age: Ignore verdicts older than this many seconds (None accepts any age)
+            
+        Returns:
+            Optional[bool]: Last login verdict, None if there is no (recent enough) verdict
+        """
+        last = self._last_login_check
+        if last is None:
+            return None
+        checked_at, _url, result = last
+        if max_age is not None and time.time() - checked_at > max_age:
+            return None
+        return result
+
+    def _invalidate_login_check(self):
+        """Drop the cached check_login() result after the page changed"""
+        self._last_login_check = None
+
+    def _probe_login_state(self, wait_seconds=0):
+        """
+        Evaluate all login indicators in the page with a single script call
+        
+        Args:
+            wait_seconds: How long the page may wait for Account or Sign In to render
+            
+        Returns:
+            dict: {account, signIn, accountText, url}
+        """
+        return self.driver.execute_async_script(_LOGIN_PROBE_JS, int(wait_seconds * 1000))
+
+    def _check_login(self):
+        """Run the login detection against the current page (caller holds the lock)"""
+        logging.debug("Checking login status...")
+        
+        # Logged in pages show an "Account" div, logged out pages a "Sign In" button.
+        # Give the page a short moment to render either of them.
+        try:
+            state = self._probe_login_state(wait_seconds=2) or {}
         except Exception as e:
-            logging.debug(f"Page source search failed: {type(e).__name__}")
+            logging.debug(f"Login probe failed: {type(e).__name__}: {e}")
+            state = {}
+        self._last_probe_url = state.get('url')
+        
+        logging.debug(f"Login probe state: {state}")
+        
+        if state.get('account'):
+            logging.info("User is logged in to Perplexity.ai (Account div found)")
+            return True
+        if state.get('signIn'):
+            logging.info("User is not logged in to Perplexity.ai (Sign In button found)")
+            return False
+        if state.get('accountText'):
+            logging.info("User is logged in to Perplexity.ai (Account text found in visible element)")
+            return True
 
         # If neither found, assume not logged in
         logging.warning("Could not determine login status, assuming not logged in")
         return False
 
+    def login_and_warmup(self, prompt):
+        """
+        Verify login and submit a warmup prompt with a single script call
+        
+        Args:
+            prompt (str): Question to submit
+        
+        Returns:
+            dict: Flags {loggedIn, inputFound, submitted}
+        """
+        if self.driver is None:
+            logging.error("Cannot send warmup prompt: Browser not started")
+            return {'loggedIn': False, 'inputFound': False, 'submitted': False}
+        
+        result = self.driver.execute_async_script(_LOGIN_AND_WARMUP_JS, prompt)
+        logging.debug(f"Warmup result: {result}")
+        return result
+
     def refresh_page(self):
         """
         Refresh the Perplexity.ai page
@@ -860,10 +1550,13 @@ class BrowserManager:
         if self.driver is None:
             logging.error("Cannot refresh page: Browser not started")
             return False
+        
+        from selenium.common.exceptions import InvalidSessionIdException
             
         try:
             self.driver.refresh()
-            time.sleep(2)  # Give page time to reload
+            self._invalidate_login_check()
+            self.wait_until_page_ready(timeout=2)
             
             # Check for Cloudflare after refresh
             if self._check_cloudflare_challenge():
@@ -881,6 +1574,7 @@ class BrowserManager:
             
     def close(self):
         """Close the browser and virtual display"""
+        self._invalidate_login_check()
         if self.driver is not None:
             try:
                 self.driver.quit()
@@ -889,14 +1583,10 @@ class BrowserManager:
             except Exception as e:
                 logging.error(f"Failed to close browser: {e}")
         
-        # Stop virtual display
+        # Release virtual display (stopped once no browser uses it)
         if self.vdisplay is not None:
-            try:
-                self.vdisplay.stop()
-                self.vdisplay = None
-                logging.info("Stopped Xvfb virtual display")
-            except Exception as e:
-                logging.debug(f"Failed to stop Xvfb: {e}")
+            self.vdisplay = None
+            _release_shared_display()
         
         # Cleanup ephemeral profile if used
         if self._ephemeral_dir:
@@ -916,7 +1606,7 @@ class BrowserManager:
                 self.start_headless_browser()
             else:
                 self.start_visible_browser()
-            time.sleep(self.config.get('browser', 'browser_load_wait_seconds') or 5)
+            self.wait_until_page_ready()
 
     def _clear_profile_singleton_locks(self, user_data_dir):
         """Remove Chromium/Edge 'Singleton*' lock files in the given profile dir.
@@ -924,47 +1614,94 @@ class BrowserManager:
         This mitigates cases where a previous crash left stale locks preventing new sessions.
         """
         try:
-            patterns = [
-                os.path.join(user_data_dir, "Singleton*"),
-            ]
             removed = 0
-            for pattern in patterns:
-                for path in glob.glob(pattern):
+            with os.scandir(user_data_dir) as entries:
+                for entry in entries:
+                    if not entry.name.startswith("Singleton"):
+                        continue
                     try:
-                        os.remove(path)
+                        os.remove(entry.path)
                         removed += 1
-                    except Exception:
+                    except OSError:
                         pass
             if removed:
                 logging.info(f"Removed {removed} stale 'Singleton*' lock files from profile dir {user_data_dir}")
         except Exception as e:
             logging.warning(f"Failed to clear profile locks in {user_data_dir}: {e}")
 
-    def _kill_profile_chrome_processes(self, user_data_dir):
-        """Terminate lingering Chrome processes that are still using the profile dir."""
-        if not user_data_dir:
+    def _wait_lock_released(self, user_data_dir, timeout=2.0):
+        """
+        Wait for Chromium's SingletonLock in the profile dir to disappear
+        
+        Args:
+            user_data_dir: Profile directory to watch
+            timeout: Maximum seconds to wait
+            
+        Returns:
+            bool: True if the lock is gone, False if it is still held (or stale)
+        """
+        # SingletonLock is a symlink to "<host>-<pid>"; lexists() also sees dangling ones
+        lock_path = os.path.join(user_data_dir, "SingletonLock")
+        return self._wait_for(lambda: not os.path.lexists(lock_path), timeout=timeout, poll=0.05)
+
+    def _profile_chrome_pids(self, user_data_dir):
+        """
+        Yield PIDs of Chrome processes launched with --user-data-dir=user_data_dir
+        
+        The argument is compared exactly: pool profiles are named <base>-pool-N, so a
+        substring test on the base profile would also match every pooled browser.
+        Uses psutil when installed (filters on the process name before reading
+        command lines, and works outside Linux); otherwise scans /proc.
+        """
+        profile_arg = f"--user-data-dir={user_data_dir}"
+        try:
+            import psutil
+        except ImportError:
+            psutil = None
+        
+        if psutil is not None:
+            for proc in psutil.process_iter(['name', 'cmdline']):
+                name = (proc.info.get('name') or '').lower()
+                if 'chrom' not in name:
+                    continue
+                cmdline = proc.info.get('cmdline') or []
+                if profile_arg in cmdline:
+                    yield proc.pid
             return
+        
         proc_dir = "/proc"
         if not os.path.isdir(proc_dir):
             return
-        killed = 0
+        # Match on raw bytes: most processes are rejected by the profile argument check
+        # without decoding or lowercasing their command line. Arguments in cmdline are
+        # NUL-terminated, so wrapping the argument in NULs matches it whole.
+        profile_bytes = b"\0" + os.fsencode(profile_arg) + b"\0"
         for entry in os.listdir(proc_dir):
             if not entry.isdigit():
                 continue
-            pid = int(entry)
             cmdline_path = os.path.join(proc_dir, entry, "cmdline")
             try:
                 with open(cmdline_path, "rb") as fh:
-                    cmdline = fh.read().decode(errors="ignore")
+                    cmdline = fh.read()
             except (FileNotFoundError, ProcessLookupError, PermissionError):
                 continue
-            if not cmdline:
+            if profile_bytes not in b"\0" + cmdline:
                 continue
-            lc_cmd = cmdline.lower()
-            if "chrome" not in lc_cmd:
-                continue
-            if user_data_dir not in cmdline:
+            if not _CHROME_CMDLINE_RE.search(cmdline):
                 continue
+            yield int(entry)
+
+    def _kill_profile_chrome_processes(self, user_data_dir):
+        """
+        Terminate lingering Chrome processes that are still using the profile dir.
+        
+        Returns:
+            int: Number of processes signalled
+        """
+        if not user_data_dir:
+            return 0
+        killed = 0
+        for pid in self._profile_chrome_pids(user_data_dir):
             try:
                 os.kill(pid, signal.SIGTERM)
                 killed += 1
@@ -974,3 +1711,4 @@ class BrowserManager:
                 logging.debug(f"No permission to terminate Chrome PID {pid}")
         if killed:
             logging.info(f"Terminated {killed} stale Chrome process(es) using profile {user_data_dir}")
+        return killed
@@ -4,12 +4,55 @@ Command-line wrapper for Perplexity.ai API server.
 This provides the implementation behind the ``askplexi`` console script.
 """
 import argparse
+import functools
+import heapq
 import json
+import mmap
 import os
 import sys
-from typing import Tuple, Optional
 
-import requests
+from .config import get_xdg_config_dir
+
+try:
+    # Optional: orjson parses large sessions.json files noticeably faster
+    from orjson import loads as _json_loads
+    _HAVE_ORJSON = True
+except ImportError:
+    _json_loads = json.loads
+    _HAVE_ORJSON = False
+
+# Below this size mapping the file costs more than reading it
+_MMAP_MIN_BYTES = 64 * 1024
+
+# Characters that mean PERPLEXITY_RESTART_CMD has to go through /bin/sh
+_SHELL_CHARS = "|&;<>()$`*?~\n"
+
+# Default number of sessions shown by --sessions
+_DEFAULT_SESSIONS_LIMIT = 50
+
+# requests is imported on first use so --help/--sessions don't pay for it
+# (and typing isn't imported at all, hence the string annotations)
+_SESSION: "requests.Session | None" = None
+
+# Seconds to wait for the TCP connect to the local server; the read timeout is per call
+_CONNECT_TIMEOUT = 5
+
+
+def get_http_session() -> "requests.Session":
+    """Return the shared HTTP session so calls to the server reuse connections."""
+    global _SESSION
+    if _SESSION is None:
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        session = requests.Session()
+        # No retries: a hung server must not multiply the read timeout, a stopped one should be
+        # reported at once, and a POST /ask must never be resent after it may have run
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=2)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        _SESSION = session
+    return _SESSION
 
 
 def get_server_url() -> str:
@@ -22,7 +65,7 @@ def call_server(
     session_id: str | None = None,
     return_sources: bool = False,
     timeout: int = 300,
-) -> Tuple[str, str | None]:
+) -> tuple[str, str | None]:
     """
     Call the Perplexity API server /ask endpoint.
 
@@ -38,10 +81,10 @@ def call_server(
     if session_id:
         payload["session_id"] = session_id
 
-    response = requests.post(
+    response = get_http_session().post(
         f"{server_url}/ask",
         json=payload,
-        timeout=timeout,
+        timeout=(_CONNECT_TIMEOUT, timeout),
     )
     response.raise_for_status()
     data = response.json()
@@ -53,7 +96,7 @@ def run_health_check(server_url: str) -> tuple[bool, dict | None, int | None]:
     Call the /health endpoint and return (ok, payload_or_none, status_code).
     """
     try:
-        resp = requests.get(f"{server_url}/health", timeout=10)
+        resp = get_http_session().get(f"{server_url}/health", timeout=(_CONNECT_TIMEOUT, 10))
         payload = None
         try:
             payload = resp.json()
@@ -87,37 +130,54 @@ def maybe_run_restart() -> None:
         f"Health check failed. Restart server with '{restart_cmd}'? [y/N]: "
     ).strip() or "n"
     if answer.lower().startswith("y"):
-        os.system(restart_cmd)
-
-
-def get_xdg_config_dir() -> str:
-    """Get XDG config directory: ~/.config/askplexi/"""
-    config_home = os.environ.get("XDG_CONFIG_HOME")
-    if config_home:
-        config_dir = os.path.join(config_home, "askplexi")
-    else:
-        config_dir = os.path.join(os.path.expanduser("~"), ".config", "askplexi")
-    os.makedirs(config_dir, exist_ok=True)
-    return config_dir
-
+        import shlex
+        import subprocess
 
+        try:
+            argv = shlex.split(restart_cmd)
+        except ValueError:
+            argv = []
+        # Plain commands run directly; pipes, expansions or VAR=value prefixes need the shell
+        try:
+            if argv and "=" not in argv[0] and not any(ch in restart_cmd for ch in _SHELL_CHARS):
+                code = subprocess.run(argv, check=False).returncode
+            else:
+                code = subprocess.run(restart_cmd, shell=True, check=False).returncode
+        except OSError as e:
+            print(f"Restart command failed: {e}", file=sys.stderr)
+            return
+        if code != 0:
+            print(f"Restart command failed (exit {code}).", file=sys.stderr)
+
+
+@functools.lru_cache(maxsize=1)
 def find_sessions_file() -> str:
     """Get sessions.json file path: ~/.config/askplexi/sessions.json"""
     config_dir = get_xdg_config_dir()
     return os.path.join(config_dir, "sessions.json")
 
 
+@functools.lru_cache(maxsize=1)
 def cli_state_file() -> str:
     """Return CLI state file path."""
     return os.path.join(get_xdg_config_dir(), "cli-state.json")
 
 
-def load_last_session_id() -> Optional[str]:
+def _read_json_file(path: str):
+    """Parse a JSON file, memory-mapping large files when orjson can read the mapping directly."""
+    with open(path, "rb") as f:
+        if _HAVE_ORJSON and os.fstat(f.fileno()).st_size >= _MMAP_MIN_BYTES:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                with memoryview(mm) as view:
+                    return _json_loads(view)
+        return _json_loads(f.read())
+
+
+def load_last_session_id() -> str | None:
     """Read last session id tracked by CLI."""
     state_path = cli_state_file()
     try:
-        with open(state_path, "r") as f:
-            data = json.load(f)
+        data = _read_json_file(state_path)
         return data.get("last_session_id")
     except FileNotFoundError:
         return None
@@ -130,15 +190,26 @@ def save_last_session_id(session_id: str | None) -> None:
     if not session_id:
         return
     state_path = cli_state_file()
+    # Write a temp file and rename it over the old one so a crash never leaves it truncated
+    tmp_path = f"{state_path}.{os.getpid()}.tmp"
     try:
-        with open(state_path, "w") as f:
-            json.dump({"last_session_id": session_id}, f, indent=2)
+        with open(tmp_path, "wb") as f:
+            f.write(json.dumps({"last_session_id": session_id}).encode())
+        os.replace(tmp_path, state_path)
     except Exception:
-        pass
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+
 
+def list_sessions(limit: int = _DEFAULT_SESSIONS_LIMIT) -> int:
+    """
+    List the most recently used sessions from sessions.json.
 
-def list_sessions() -> int:
-    """List all sessions from sessions.json."""
+    Args:
+        limit: Maximum number of sessions to print (0 prints all of them)
+    """
     sessions_file = find_sessions_file()
     
     if not os.path.exists(sessions_file):
@@ -147,8 +218,7 @@ def list_sessions() -> int:
         return 1
     
     try:
-        with open(sessions_file, "r") as f:
-            data = json.load(f)
+        data = _read_json_file(sessions_file)
     except Exception as e:
         print(f"Error reading sessions file: {e}", file=sys.stderr)
         return 1
@@ -164,34 +234,84 @@ def list_sessions() -> int:
     print(f"Total sessions: {len(sessions)}")
     if current_session:
         print(f"Current session: {current_session}")
+    if limit and len(sessions) > limit:
+        print(f"Showing the {limit} most recently used (--limit 0 shows all)")
     print()
     
-    # Sort by last_used_at (most recent first)
-    sorted_sessions = sorted(
-        sessions.items(),
-        key=lambda x: x[1].get("last_used_at", ""),
-        reverse=True,
-    )
+    # Most recent first; nlargest only keeps `limit` entries around
+    keyed = [(info.get("last_used_at", ""), session_id, info) for session_id, info in sessions.items()]
+    if limit:
+        recent = heapq.nlargest(limit, keyed, key=lambda x: x[0])
+    else:
+        recent = sorted(keyed, key=lambda x: x[0], reverse=True)
     
-    for session_id, info in sorted_sessions:
+    # Build the listing first and write it in one go rather than print() per line
+    out = []
+    for _, session_id, info in recent:
         is_current = " (current)" if session_id == current_session else ""
-        print(f"Session: {session_id}{is_current}")
+        out.append(f"Session: {session_id}{is_current}\n")
         if "created_at" in info:
-            print(f"  Created: {info['created_at']}")
+            out.append(f"  Created: {info['created_at']}\n")
         if "last_used_at" in info:
-            print(f"  Last used: {info['last_used_at']}")
+            out.append(f"  Last used: {info['last_used_at']}\n")
         if "url" in info:
             url = info["url"]
             # Truncate long URLs
             if len(url) > 80:
                 url = url[:77] + "..."
-            print(f"  URL: {url}")
-        print()
+            out.append(f"  URL: {url}\n")
+        out.append("\n")
+    sys.stdout.write("".join(out))
     
     return 0
 
 
-def main(argv: list[str] | None = None) -> int:
+def count_sessions() -> int:
+    """Print the number of sessions in sessions.json without loading their details."""
+    sessions_file = find_sessions_file()
+    
+    if not os.path.exists(sessions_file):
+        print(f"No sessions file found at {sessions_file}", file=sys.stderr)
+        return 1
+    
+    try:
+        try:
+            # Optional: ijson streams the top-level "sessions" object key by key
+            import ijson
+        except ImportError:
+            count = len(_read_json_file(sessions_file).get("sessions", {}))
+        else:
+            with open(sessions_file, "rb") as f:
+                count = sum(1 for _ in ijson.kvitems(f, "sessions"))
+    except Exception as e:
+        print(f"Error reading sessions file: {e}", file=sys.stderr)
+        return 1
+    
+    print(count)
+    return 0
+
+
+def health_command(server_url: str) -> int:
+    """Run the health check, print the result and offer a restart on failure."""
+    ok, payload, status_code = run_health_check(server_url)
+    if payload:
+        print(json.dumps(payload, indent=2))
+    if ok:
+        print("Health: OK")
+        return 0
+    reason = "unknown issue"
+    if isinstance(payload, dict):
+        reason = payload.get("message") or payload.get("error") or str(payload)
+    print(f"Health: FAIL ({reason})")
+    if status_code:
+        print(f"HTTP status: {status_code}")
+    maybe_run_restart()
+    return 1
+
+
+@functools.lru_cache(maxsize=1)
+def build_parser() -> argparse.ArgumentParser:
+    """Build the askplexi argument parser (once per process; parse_args doesn't modify it)."""
     parser = argparse.ArgumentParser(
         description="Ask Perplexity.ai a question via local API server",
         formatter_class=argparse.RawDescriptionHelpFormatter,
@@ -201,6 +321,8 @@ Examples:
   askplexi "What is 2+2?" --id "session-id-123"
   askplexi "What is 2+2?" --continue
   askplexi --sessions
+  askplexi --sessions --limit 10
+  askplexi --sessions --count-only
 """,
     )
 
@@ -228,7 +350,19 @@ Examples:
     parser.add_argument(
         "--sessions",
         action="store_true",
-        help="List all sessions from sessions.json",
+        help="List sessions from sessions.json, most recently used first",
+    )
+    parser.add_argument(
+        "--limit",
+        type=int,
+        default=_DEFAULT_SESSIONS_LIMIT,
+        metavar="N",
+        help=f"With --sessions, show at most N sessions (default: {_DEFAULT_SESSIONS_LIMIT}, 0 shows all)",
+    )
+    parser.add_argument(
+        "--count-only",
+        action="store_true",
+        help="With --sessions, only print the number of sessions",
     )
     parser.add_argument(
         "--health",
@@ -240,31 +374,38 @@ Examples:
         action="store_true",
         help="Open a visible browser window to re-authenticate Perplexity",
     )
+    parser.add_argument(
+        "--force-login",
+        action="store_true",
+        help="With --manual-login, log in again even if the saved cookies are still valid",
+    )
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    if argv is None:
+        argv = sys.argv[1:]
+
+    # Fast paths: a bare --sessions/--health doesn't need the full parser
+    if argv == ["--sessions"]:
+        return list_sessions()
+    if argv == ["--health"]:
+        return health_command(get_server_url())
 
+    parser = build_parser()
     args = parser.parse_args(argv)
     
     # Handle --sessions flag (exit early)
     if args.sessions:
-        return list_sessions()
+        if args.count_only:
+            return count_sessions()
+        return list_sessions(limit=max(0, args.limit))
     
     server_url = get_server_url()
 
     # Handle --health flag
     if args.health:
-        ok, payload, status_code = run_health_check(server_url)
-        if payload:
-            print(json.dumps(payload, indent=2))
-        if ok:
-            print("Health: OK")
-            return 0
-        reason = "unknown issue"
-        if isinstance(payload, dict):
-            reason = payload.get("message") or payload.get("error") or str(payload)
-        print(f"Health: FAIL ({reason})")
-        if status_code:
-            print(f"HTTP status: {status_code}")
-        maybe_run_restart()
-        return 1
+        return health_command(server_url)
 
     if args.manual_login:
         try:
@@ -273,7 +414,7 @@ Examples:
             print("Manual login module not available inside package.", file=sys.stderr)
             return 1
         try:
-            manual_login_main()
+            manual_login_main(force=args.force_login)
             return 0
         except SystemExit as exc:
             return exc.code or 0
@@ -295,14 +436,18 @@ Examples:
             )
             return 1
 
-    # Get question from argument or stdin
+    # Get question from argument or piped stdin (an interactive terminal would just block)
     if args.question:
         question = args.question
-    else:
+    elif not sys.stdin.isatty():
         question = sys.stdin.read().strip()
-        if not question:
-            parser.print_help()
-            return 1
+    else:
+        question = ""
+    if not question:
+        parser.print_help()
+        return 1
+
+    import requests
 
     try:
         response_text, session_id = call_server(
@@ -1,22 +1,75 @@
 """
 Configuration management for Perplexity.ai automation
 """
+import functools
 import json
 import os
 import logging
+from types import MappingProxyType
 
+# Resolved once: expanduser may fall back to a passwd lookup when $HOME is unset
+_HOME = os.path.expanduser("~")
 
+# Parsed config files as {abspath: (mtime_ns, parsed)} so repeated Config() calls skip
+# json.load; one entry per path, replaced when the file changes
+_CONFIG_CACHE = {}
+
+# Built-in configuration used when config.json is missing or unreadable
+# (browser.user_data_dir is filled in by Config._get_defaults)
+_DEFAULTS = MappingProxyType({
+    "browser": MappingProxyType({
+        "perplexity_url": "https://www.perplexity.ai/?login-source=signupButton&login-new=false",
+        "headless": True,
+        "use_xvfb": True,
+        "browser_load_wait_seconds": 5,
+        "chrome_driver_path": None,
+        "cookies_file": None,
+        "pool_size": 1,
+        "max_uses_per_browser": 50,
+        "disable_gpu": False,
+        "no_sandbox": None,
+        "login_detect_timeout_seconds": 45
+    }),
+    "perplexity": MappingProxyType({
+        "default_model": "Claude Sonnet 4.5",
+        "default_reasoning": True,
+        "question_input_timeout": 10,
+        "response_wait_timeout": 300,
+        "element_wait_timeout": 30
+    }),
+})
+
+
+@functools.lru_cache(maxsize=1)
 def get_xdg_config_dir() -> str:
-    """Get XDG config directory: ~/.config/askplexi/"""
+    """
+    Get XDG config directory: ~/.config/askplexi/
+
+    Resolved (and created) once per process; call get_xdg_config_dir.cache_clear()
+    after changing XDG_CONFIG_HOME.
+    """
     config_home = os.environ.get("XDG_CONFIG_HOME")
     if config_home:
         config_dir = os.path.join(config_home, "askplexi")
     else:
-        config_dir = os.path.join(os.path.expanduser("~"), ".config", "askplexi")
+        config_dir = os.path.join(_HOME, ".config", "askplexi")
     os.makedirs(config_dir, exist_ok=True)
     return config_dir
 
 
+def get_xdg_data_dir() -> str:
+    """Get XDG data directory: ~/.local/share/askplexi/"""
+    data_home = os.environ.get("XDG_DATA_HOME")
+    if data_home:
+        return os.path.join(data_home, "askplexi")
+    return os.path.join(_HOME, ".local", "share", "askplexi")
+
+
+def get_default_user_data_dir() -> str:
+    """Get the persistent browser profile directory: ~/.local/share/askplexi/browser-profile/"""
+    return os.path.join(get_xdg_data_dir(), "browser-profile")
+
+
 class Config:
     """Configuration manager for Perplexity.ai Automation"""
     
@@ -38,44 +91,38 @@ class Config:
     def load(self):
         """Load configuration from file"""
         try:
-            if os.path.exists(self.config_path):
-                with open(self.config_path, 'r') as f:
-                    self._config = json.load(f)
-            else:
+            try:
+                mtime_ns = os.stat(self.config_path).st_mtime_ns
+            except FileNotFoundError:
                 # Use defaults
                 self._config = self._get_defaults()
                 logging.warning(f"Config file not found at {self.config_path}, using defaults")
+                return
+            
+            path = os.path.abspath(self.config_path)
+            cached = _CONFIG_CACHE.get(path)
+            if cached is not None and cached[0] == mtime_ns:
+                parsed = cached[1]
+            else:
+                with open(self.config_path, 'r') as f:
+                    parsed = json.load(f)
+                _CONFIG_CACHE[path] = (mtime_ns, parsed)
+            # Copy the sections: callers tweak them in place (e.g. the headless flag)
+            self._config = {
+                section: dict(values) if isinstance(values, dict) else values
+                for section, values in parsed.items()
+            }
         except Exception as e:
             logging.error(f"Error loading configuration: {e}")
             self._config = self._get_defaults()
     
     def _get_defaults(self):
         """Get default configuration"""
+        # Fresh section dicts, since callers tweak the loaded config in place
+        defaults = {section: dict(values) for section, values in _DEFAULTS.items()}
         # Get XDG data directory for browser profile
-        data_home = os.environ.get("XDG_DATA_HOME")
-        if data_home:
-            browser_profile = os.path.join(data_home, "askplexi", "browser-profile")
-        else:
-            browser_profile = os.path.join(os.path.expanduser("~"), ".local", "share", "askplexi", "browser-profile")
-        
-        return {
-            "browser": {
-                "perplexity_url": "https://www.perplexity.ai/?login-source=signupButton&login-new=false",
-                "user_data_dir": browser_profile,
-                "headless": True,
-                "use_xvfb": True,
-                "browser_load_wait_seconds": 5,
-                "chrome_driver_path": None,
-                "login_detect_timeout_seconds": 45
-            },
-            "perplexity": {
-                "default_model": "Claude Sonnet 4.5",
-                "default_reasoning": True,
-                "question_input_timeout": 10,
-                "response_wait_timeout": 300,
-                "element_wait_timeout": 30
-            }
-        }
+        defaults["browser"]["user_data_dir"] = get_default_user_data_dir()
+        return defaults
     
     def get(self, section, key=None):
         """
@@ -0,0 +1,17 @@
+"""
+Shared logging configuration for the entry points
+"""
+import logging
+
+LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+
+
+def configure_logging(debug: bool = False, fmt: str = LOG_FORMAT) -> None:
+    """
+    Configure root logging once per process
+    
+    Args:
+        debug: Log at DEBUG instead of INFO level
+        fmt: Log record format (default: LOG_FORMAT)
+    """
+    logging.basicConfig(level=logging.DEBUG if debug else logging.INFO, format=fmt)
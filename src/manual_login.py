@@ -1,14 +1,19 @@
+import logging
 import os
 import subprocess
+import threading
 import time
 
-from selenium.common.exceptions import SessionNotCreatedException
-
 from .browser import BrowserManager
 from .config import Config
+from .logging_setup import configure_logging
+
+logger = logging.getLogger(__name__)
 
 DEFAULT_SERVICE_NAME = "perplexity-api"
 SERVICE_ENV_VAR = "PERPLEXITY_SERVICE_NAME"
+# How long teardown waits for the background first prompt before closing the browser
+FIRST_PROMPT_JOIN_TIMEOUT = 20
 
 
 def _run_systemctl(args, capture: bool = True) -> subprocess.CompletedProcess:
@@ -33,138 +38,238 @@ def get_service_name() -> str:
     return os.environ.get(SERVICE_ENV_VAR, DEFAULT_SERVICE_NAME)
 
 
+def get_service_state(service_name: str) -> dict:
+    """
+    Return the unit's LoadState/ActiveState/SubState/UnitFileState from a single systemctl show call.
+
+    Returns an empty dict if systemctl is unavailable.
+    """
+    result = _run_systemctl(
+        ["show", service_name, "--property=LoadState,ActiveState,SubState,UnitFileState"]
+    )
+    state = {}
+    for line in (result.stdout or "").splitlines():
+        key, sep, value = line.partition("=")
+        if sep:
+            state[key] = value
+    return state
+
+
 def is_service_active(service_name: str) -> bool:
     """Return True if the user service is currently active."""
-    result = _run_systemctl(["is-active", "--quiet", service_name], capture=False)
-    return result.returncode == 0
+    return get_service_state(service_name).get("ActiveState") == "active"
+
 
+def service_is_manageable(state: dict) -> bool:
+    """Return True if the unit described by get_service_state() exists and can be started."""
+    return bool(state) and state.get("LoadState") != "not-found" and state.get("UnitFileState") != "masked"
 
-def stop_service(service_name: str) -> bool:
+
+def stop_service(service_name: str, state: dict | None = None) -> bool:
     """
     Stop the service if it is running.
 
+    Args:
+        service_name: Unit to stop
+        state: Result of get_service_state() if the caller already has it
+
     Returns True if the service was active before this call (regardless of stop success).
     """
-    if not is_service_active(service_name):
-        print(
-            f"[MANUAL LOGIN] Service '{service_name}' is not running; skipping stop step."
-        )
+    if state is None:
+        state = get_service_state(service_name)
+    if state.get("ActiveState") != "active":
+        if state.get("LoadState") == "not-found":
+            logger.info(
+                "[MANUAL LOGIN] Service '%s' is not installed; skipping stop step.", service_name
+            )
+        else:
+            logger.info(
+                "[MANUAL LOGIN] Service '%s' is not running; skipping stop step.", service_name
+            )
         return False
 
-    print(f"[MANUAL LOGIN] Detected running service '{service_name}'. Stopping to avoid profile conflicts...")
+    logger.info("[MANUAL LOGIN] Detected running service '%s'. Stopping to avoid profile conflicts...", service_name)
     result = _run_systemctl(["stop", service_name])
     if result.returncode != 0:
         stderr = (result.stderr or "").strip()
-        print(
-            f"[MANUAL LOGIN] Warning: Could not stop service '{service_name}' "
-            f"(exit {result.returncode}). Manual intervention may be required."
+        logger.warning(
+            "[MANUAL LOGIN] Could not stop service '%s' (exit %s). Manual intervention may be required.",
+            service_name,
+            result.returncode,
         )
         if stderr:
-            print(f"[MANUAL LOGIN] systemctl output: {stderr}")
+            logger.warning("[MANUAL LOGIN] systemctl output: %s", stderr)
     else:
-        # Wait briefly for the service to fully stop.
-        for _ in range(10):
-            if not is_service_active(service_name):
-                break
-            time.sleep(0.5)
-        print(f"[MANUAL LOGIN] Service '{service_name}' stopped.")
+        # systemctl stop only returns once systemd reports the stop job done, so no polling needed
+        logger.info("[MANUAL LOGIN] Service '%s' stopped.", service_name)
     return True
 
 
 def start_service(service_name: str) -> None:
-    """Start the service and wait until systemd reports it active."""
-    print(f"[MANUAL LOGIN] Restarting service '{service_name}'...")
+    """
+    Start the service and wait until systemd reports it active.
+
+    systemctl start blocks until the start job finishes, which for our Type=notify unit
+    means the server has sent READY=1, so a single state check afterwards is enough.
+    """
+    logger.info("[MANUAL LOGIN] Restarting service '%s'...", service_name)
     result = _run_systemctl(["start", service_name])
     if result.returncode != 0:
         stderr = (result.stderr or "").strip()
-        print(
-            f"[MANUAL LOGIN] Warning: Failed to start service '{service_name}' "
-            f"(exit {result.returncode}). Please start it manually."
+        logger.warning(
+            "[MANUAL LOGIN] Failed to start service '%s' (exit %s). Please start it manually.",
+            service_name,
+            result.returncode,
         )
         if stderr:
-            print(f"[MANUAL LOGIN] systemctl output: {stderr}")
+            logger.warning("[MANUAL LOGIN] systemctl output: %s", stderr)
         return
 
-    for _ in range(20):
-        if is_service_active(service_name):
-            print(f"[MANUAL LOGIN] Service '{service_name}' is running again.")
-            return
-        time.sleep(0.5)
-    print(
-        f"[MANUAL LOGIN] Warning: Service '{service_name}' did not report active status. "
-        "Check systemctl logs manually."
+    if is_service_active(service_name):
+        logger.info("[MANUAL LOGIN] Service '%s' is running again.", service_name)
+        return
+    logger.warning(
+        "[MANUAL LOGIN] Service '%s' did not report active status. Check systemctl logs manually.",
+        service_name,
     )
 
 
 def run_first_prompt(driver, browser_manager, config):
     """Send first prompt after manual login to persist cookies."""
-    print("[MANUAL LOGIN] Sending first prompt to store login cookie...")
-    print(
+    logger.info("[MANUAL LOGIN] Sending first prompt to store login cookie...")
+    logger.info(
         "[MANUAL LOGIN] This is the first prompt to store the login cookie. "
         "Just say 'nice to meet you'"
     )
     try:
-        # Set global browser references so ask_plexi uses the existing browser
-        from . import perplexity as perplexity_module
+        result = browser_manager.login_and_warmup(
+            "Just say 'nice to meet you' - don't Lookup anything."
+        )
+        if result.get("submitted"):
+            logger.info("[MANUAL LOGIN] First prompt sent successfully. Login cookie stored.")
+        else:
+            logger.warning("[MANUAL LOGIN] First prompt was not submitted: %s", result)
+    except Exception as e:
+        logger.warning("[MANUAL LOGIN] Error sending first prompt: %s", e)
 
-        perplexity_module._browser_driver = driver
-        perplexity_module._browser_manager = browser_manager
 
-        from .perplexity import ask_plexi
+def saved_login_is_valid(config) -> bool:
+    """
+    Check whether the persisted login cookies still authenticate.
 
-        response, session_id, final_url = ask_plexi(
-            "Just say 'nice to meet you' - don't Lookup anything.",
-            config=config,
-            debug=False,
-            headless=False,
-        )
-        print("[MANUAL LOGIN] First prompt sent successfully. Login cookie stored.")
+    Uses a throwaway headless profile, so the running service doesn't need to be stopped.
+    """
+    browser_manager = BrowserManager(config)
+    if not browser_manager.has_saved_cookies():
+        return False
+
+    logger.info("[MANUAL LOGIN] Checking saved login cookies in a headless browser...")
+    try:
+        browser_manager.start_headless_browser(use_ephemeral=True)
+        return browser_manager.check_login()
     except Exception as e:
-        print(f"[MANUAL LOGIN] Warning: Error sending first prompt: {e}")
+        logger.warning("[MANUAL LOGIN] Could not verify saved cookies: %s", e)
+        return False
+    finally:
+        try:
+            browser_manager.close()
+        except Exception:
+            pass
+
 
+def main(force: bool = False):
+    # Selenium is only needed once we actually open a browser
+    from selenium.common.exceptions import SessionNotCreatedException, TimeoutException
+    from selenium.webdriver.support.ui import WebDriverWait
 
-def main():
-    print("[MANUAL LOGIN] Starting Chromium/Chrome in visible mode for manual login...")
+    configure_logging(fmt="%(levelname)s: %(message)s")
+    config = Config()
+
+    if not force and saved_login_is_valid(config):
+        logger.info(
+            "[MANUAL LOGIN] Saved login cookies are still valid; no manual login needed. "
+            "Use --force-login to log in again anyway."
+        )
+        return
+
+    logger.info("[MANUAL LOGIN] Starting Chromium/Chrome in visible mode for manual login...")
 
     service_name = get_service_name()
-    stop_service(service_name)
+    # One systemctl show drives both the stop and the restart decisions
+    service_state = get_service_state(service_name)
+    manage_service = service_is_manageable(service_state)
+    if manage_service:
+        stop_service(service_name, service_state)
+    else:
+        logger.info(
+            "[MANUAL LOGIN] Service '%s' is not installed or is masked; leaving it alone.", service_name
+        )
 
-    config = Config()
     browser_manager = BrowserManager(config)
     perplexity_url = (
         config.get("browser", "perplexity_url")
         or "https://www.perplexity.ai/?login-source=signupButton&login-new=false"
     )
     driver = None
+    first_prompt_thread = None
 
     try:
-        driver = browser_manager.start_visible_browser(use_ephemeral=False)
+        driver = browser_manager.start_visible_browser(use_ephemeral=False, manual_login=True)
+        if force:
+            # Drop the profile's own session so the old login can't be detected as a new one
+            logger.info("[MANUAL LOGIN] --force-login: clearing the existing Perplexity cookies.")
+            driver.delete_all_cookies()
         driver.get(perplexity_url)
-        print("[MANUAL LOGIN] Please log in to Perplexity.ai in the opened Chromium/Chrome window.")
-        print("[MANUAL LOGIN] This window will auto-close once login is detected.")
+        logger.info("[MANUAL LOGIN] Please log in to Perplexity.ai in the opened Chromium/Chrome window.")
+        logger.info("[MANUAL LOGIN] This window will auto-close once login is detected.")
 
         timeout_seconds = 600
-        poll_interval = 2
-        deadline = time.time() + timeout_seconds
+        progress_interval = 10
+        start_time = time.time()
+        last_progress = start_time
         success = False
-        check_count = 0
-
-        while time.time() < deadline:
-            check_count += 1
-            elapsed = time.time() - (deadline - timeout_seconds)
-
-            if check_count % 5 == 0:
-                remaining = int(max(0, deadline - time.time()))
-                print(f"[MANUAL LOGIN] Still checking... ({int(elapsed)}s elapsed, {remaining}s remaining)")
-
+        # A session cookie that was already there may be expired or revoked
+        initial_token = browser_manager.session_token()
+        stale_token = None
+
+        def _login_detected(_driver):
+            nonlocal last_progress, stale_token
+            now = time.time()
+            if now - last_progress >= progress_interval:
+                elapsed = int(now - start_time)
+                remaining = int(max(0, timeout_seconds - elapsed))
+                logger.info("[MANUAL LOGIN] Still checking... (%ds elapsed, %ds remaining)", elapsed, remaining)
+                last_progress = now
+            # The cookie check is cheap; the DOM probe (which waits for the page to render)
+            # only runs to confirm a session cookie that predates the wait, once per value
+            token = browser_manager.session_token()
+            if not token or token == stale_token:
+                return False
+            if token != initial_token:
+                return True
             if browser_manager.check_login():
-                success = True
-                print(f"[MANUAL LOGIN] Login detected after {int(elapsed)}s!")
-                run_first_prompt(driver, browser_manager, config)
-                print("[MANUAL LOGIN] Session saved. Closing browser...")
-                break
+                return True
+            stale_token = token
+            return False
+
+        try:
+            WebDriverWait(driver, timeout_seconds, poll_frequency=0.2).until(_login_detected)
+            success = True
+        except TimeoutException:
+            pass
 
-            time.sleep(poll_interval)
+        if success:
+            elapsed = time.time() - start_time
+            logger.info("[MANUAL LOGIN] Login detected after %ds!", elapsed)
+            browser_manager.save_cookies()
+            # Cookies are already on disk; the warmup prompt only needs to finish before teardown
+            first_prompt_thread = threading.Thread(
+                target=run_first_prompt,
+                args=(driver, browser_manager, config),
+                daemon=True,
+            )
+            first_prompt_thread.start()
+            logger.info("[MANUAL LOGIN] Session saved. Closing browser...")
     except SessionNotCreatedException as exc:
         raise SystemExit(
             "[MANUAL LOGIN] Failed to launch Chromium via Selenium: "
@@ -172,15 +277,23 @@ def main():
             "the shared profile. Close other Chromium windows and retry."
         ) from exc
     finally:
+        if first_prompt_thread is not None:
+            first_prompt_thread.join(timeout=FIRST_PROMPT_JOIN_TIMEOUT)
+            if first_prompt_thread.is_alive():
+                logger.warning(
+                    "[MANUAL LOGIN] First prompt did not finish within %ds; closing browser anyway.",
+                    FIRST_PROMPT_JOIN_TIMEOUT,
+                )
         try:
             browser_manager.close()
         except Exception:
             pass
         # Always attempt to restart the service to keep the API available after login.
-        start_service(service_name)
+        if manage_service:
+            start_service(service_name)
 
     if success:
-        print("[MANUAL LOGIN] Login session saved. You can now use ask_plexi() in headless mode.")
+        logger.info("[MANUAL LOGIN] Login session saved. You can now use ask_plexi() in headless mode.")
     else:
         raise SystemExit("[MANUAL LOGIN] Timed out waiting for login. Please rerun and log in.")
 
@@ -3,7 +3,6 @@ Perplexity.ai automation module
 """
 import time
 import logging
-import pyperclip
 import re
 from typing import Optional, Tuple
 from selenium.webdriver.common.by import By
@@ -12,7 +11,6 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import (
     TimeoutException,
-    NoSuchElementException,
     InvalidElementStateException,
     StaleElementReferenceException,
 )
@@ -29,6 +27,115 @@ _logger = logging.getLogger(__name__)
 _logger.setLevel(logging.INFO)  # Default to INFO level
 
 
+# Reads every response-completion indicator in one round-trip instead of a
+# find_element/is_displayed/get_attribute call per indicator.
+# arguments[0]: use the last Copy button in DOM order instead of the first
+_COMPLETION_STATE_JS = """
+const isVisible = (el) => {
+    if (!el || el.getClientRects().length === 0) return false;
+    const style = window.getComputedStyle(el);
+    return style.visibility !== 'hidden' && style.display !== 'none';
+};
+const stop = document.querySelector("button[data-testid='stop-generating-response-button']");
+const submit = document.querySelector("button[data-testid='submit-button']");
+const copies = document.querySelectorAll("button[aria-label='Copy']");
+const copy = copies.length ? copies[arguments[0] ? copies.length - 1 : 0] : null;
+const state = {
+    stopFound: !!stop,
+    stopVisible: isVisible(stop),
+    submitFound: !!submit,
+    submitDisabled: !!submit && (submit.disabled || submit.hasAttribute('disabled')),
+    submitVisible: isVisible(submit),
+    copyFound: !!copy,
+    copyVisible: isVisible(copy),
+    markdownLength: 0,
+    markdownSelector: null,
+    url: location.href,
+    title: document.title,
+};
+const markdownSelectors = [
+    "div[id^='markdown-content']",
+    "div[id*='markdown-content']",
+    "div.markdown-content",
+    "[id*='markdown']",
+];
+for (const selector of markdownSelectors) {
+    const el = document.querySelector(selector);
+    if (!el) continue;
+    state.markdownLength = (el.innerText || '').trim().length;
+    state.markdownSelector = selector;
+    if (state.markdownLength >= 10) break;
+}
+return state;
+"""
+
+
+def _read_completion_state(driver, last_copy: bool = False) -> dict:
+    """
+    Read the stop/submit/copy button and markdown state with a single script call
+    
+    Args:
+        driver: Selenium WebDriver instance
+        last_copy: Check the last Copy button on the page instead of the first
+        
+    Returns:
+        dict: {stopFound, stopVisible, submitFound, submitDisabled, submitVisible,
+               copyFound, copyVisible, markdownLength, markdownSelector, url, title}
+    """
+    return driver.execute_script(_COMPLETION_STATE_JS, last_copy) or {}
+
+
+# Picks the bottom-most visible Copy button (the latest answer) in one round-trip;
+# falls back to the last one in DOM order when none is visible
+_BOTTOM_COPY_BUTTON_JS = """
+const buttons = document.querySelectorAll("button[aria-label='Copy']");
+let best = null;
+let bestY = -Infinity;
+for (const btn of buttons) {
+    const rects = btn.getClientRects();
+    if (rects.length === 0) continue;
+    const style = window.getComputedStyle(btn);
+    if (style.visibility === 'hidden' || style.display === 'none') continue;
+    const y = rects[0].top + window.scrollY;
+    if (y > bestY) {
+        best = btn;
+        bestY = y;
+    }
+}
+return best || (buttons.length ? buttons[buttons.length - 1] : null);
+"""
+
+
+def _find_bottom_copy_button(driver):
+    """
+    Return the Copy button of the most recent answer
+    
+    Args:
+        driver: Selenium WebDriver instance
+        
+    Raises:
+        Exception: If the page has no Copy button
+    """
+    copy_button = driver.execute_script(_BOTTOM_COPY_BUTTON_JS)
+    if copy_button is None:
+        raise Exception("Copy button not found")
+    return copy_button
+
+
+def _page_html(driver) -> str:
+    """
+    Return the current document's HTML
+    
+    Uses CDP DOM.getOuterHTML, which serializes natively instead of through a page script
+    like driver.page_source; falls back to page_source if CDP isn't available.
+    """
+    try:
+        root = driver.execute_cdp_cmd('DOM.getDocument', {'depth': 0})['root']['nodeId']
+        return driver.execute_cdp_cmd('DOM.getOuterHTML', {'nodeId': root})['outerHTML']
+    except Exception:
+        return driver.page_source
+
+
 # Module-level browser instance for persistence
 _browser_manager = None
 _browser_driver = None
@@ -112,43 +219,70 @@ def _get_browser_manager(config):
     return _browser_manager
 
 
-def _ensure_browser_started(config):
-    """Ensure browser is started and ready"""
-    global _browser_driver, _browser_manager
-    
-    manager = _get_browser_manager(config)
+def _start_or_reuse_driver(manager, driver, config):
+    """Return driver if its session is still valid, otherwise start a new browser on manager"""
+    # A background launch (start_headless_browser_async) may still be in flight
+    driver = manager.wait_until_started() or driver
     
     # Check if browser is already running and valid
-    if _browser_driver is not None:
+    if driver is not None:
         try:
             # Try to get current URL to verify session is valid
-            _browser_driver.current_url
-            return _browser_driver
+            driver.current_url
+            return driver
         except Exception:
             # Session is invalid, reset
-            _browser_driver = None
             manager.driver = None
     
     # Start browser if not running
     headless = config.get('browser', 'headless') or False
     if headless:
-        _browser_driver = manager.start_headless_browser()
+        driver = manager.start_headless_browser()
     else:
-        _browser_driver = manager.start_visible_browser()
+        driver = manager.start_visible_browser()
     
-    manager.driver = _browser_driver
+    manager.driver = driver
     
-    # Wait for page to load (reduced from 5 to 2 seconds for faster startup)
-    time.sleep(config.get('browser', 'browser_load_wait_seconds') or 2)
+    # Wait for page to load, bounded by browser_load_wait_seconds
+    manager.wait_until_page_ready(timeout=config.get('browser', 'browser_load_wait_seconds') or 2)
     
-    return _browser_driver
+    return driver
 
 
-def _ensure_logged_in(config):
-    """Ensure user is logged in, prompt for login if not"""
-    global _browser_driver, _browser_manager
+def _ensure_browser_started(config, manager=None):
+    """
+    Ensure browser is started and ready
+    
+    Args:
+        config: Configuration object
+        manager: BrowserManager to use (default: the module-level browser manager)
+    
+    Returns:
+        webdriver: The running WebDriver instance
+    """
+    global _browser_driver
+    
+    if manager is not None:
+        return _start_or_reuse_driver(manager, manager.driver, config)
     
     manager = _get_browser_manager(config)
+    _browser_driver = _start_or_reuse_driver(manager, _browser_driver, config)
+    return _browser_driver
+
+
+def _ensure_logged_in(config, manager=None):
+    """
+    Ensure user is logged in, prompt for login if not
+    
+    Args:
+        config: Configuration object
+        manager: BrowserManager to use (default: the module-level browser manager)
+    """
+    global _browser_driver
+    
+    use_module_browser = manager is None
+    if use_module_browser:
+        manager = _get_browser_manager(config)
     
     if manager.check_login():
         return True
@@ -157,19 +291,20 @@ def _ensure_logged_in(config):
     logging.info("User not logged in. Opening visible browser for manual login...")
     
     # Close current browser if it exists
-    if _browser_driver is not None:
+    if manager.driver is not None:
         try:
             manager.close()
         except Exception:
             pass
+    if use_module_browser:
         _browser_driver = None
     
     # Start visible browser for login
-    manager.start_visible_browser()
+    manager.start_visible_browser(manual_login=True)
     manager.driver.get(config.get('browser', 'perplexity_url'))
     
-    print("[MANUAL LOGIN] Please log in to Perplexity.ai in the opened browser window.")
-    print("[MANUAL LOGIN] Waiting for login to complete...")
+    logging.info("[MANUAL LOGIN] Please log in to Perplexity.ai in the opened browser window.")
+    logging.info("[MANUAL LOGIN] Waiting for login to complete...")
     
     # Wait for login with timeout
     timeout_seconds = 600  # 10 minutes
@@ -177,16 +312,19 @@ def _ensure_logged_in(config):
     
     while time.time() - start_time < timeout_seconds:
         if manager.check_login():
-            print("[MANUAL LOGIN] Login successful!")
+            logging.info("[MANUAL LOGIN] Login successful!")
+            manager.save_cookies()
             # Update global driver reference
-            _browser_driver = manager.driver
+            if use_module_browser:
+                _browser_driver = manager.driver
             return True
         time.sleep(2)
     
     raise Exception("Login timeout: Please log in manually and try again")
 
 
-def ask_plexi(question, model=None, reasoning=None, config=None, debug=False, headless=None):
+def ask_plexi(question, model=None, reasoning=None, config=None, debug=False, headless=None, browser_manager=None,
+              use_system_clipboard=None):
     """
     Ask a question to Perplexity.ai and return the response
     
@@ -197,6 +335,9 @@ def ask_plexi(question, model=None, reasoning=None, config=None, debug=False, he
         config: Configuration object. If None, loads from config.json
         debug (bool): Enable debug logging (default: False)
         headless (bool, optional): Override headless mode from config (default: None, uses config)
+        browser_manager (BrowserManager, optional): Browser to run on (default: module-level browser)
+        use_system_clipboard (bool, optional): Allow pyperclip fallbacks that go through the
+            system clipboard (default: None, only when the browser is visible)
     
     Returns:
         Tuple[str, Optional[str], str]: (response_text, session_id, final_url)
@@ -248,9 +389,12 @@ def ask_plexi(question, model=None, reasoning=None, config=None, debug=False, he
         reasoning = config.get('perplexity', 'default_reasoning')
         if reasoning is None:
             reasoning = True
+    # A headless/Xvfb browser doesn't share the system clipboard, so pyperclip can't help there
+    if use_system_clipboard is None:
+        use_system_clipboard = not config.get('browser', 'headless')
     
     # Ensure browser is started
-    driver = _ensure_browser_started(config)
+    driver = _ensure_browser_started(config, browser_manager)
     
     # Skip login check - browser is already logged in from server startup
     # Only check if we're not on a Perplexity page (indicates browser was just started)
@@ -258,11 +402,11 @@ def ask_plexi(question, model=None, reasoning=None, config=None, debug=False, he
         current_url = driver.current_url
         if 'perplexity.ai' not in current_url:
             log_with_timing("Checking login status...")
-            _ensure_logged_in(config)
+            _ensure_logged_in(config, browser_manager)
     except Exception:
         # Browser might be invalid, check login
         log_with_timing("Checking login status...")
-        _ensure_logged_in(config)
+        _ensure_logged_in(config, browser_manager)
     
     # Navigate to Perplexity.ai main page (force new session)
     perplexity_url = config.get('browser', 'perplexity_url')
@@ -279,9 +423,6 @@ def ask_plexi(question, model=None, reasoning=None, config=None, debug=False, he
         log_with_timing("Navigating to Perplexity.ai main page (new session)...")
         driver.get(base_url)
     
-    element_wait_timeout = config.get('perplexity', 'element_wait_timeout') or 30
-    wait = WebDriverWait(driver, element_wait_timeout)
-    
     def _dump_html(label):
         """Helper to dump HTML for debugging"""
         try:
@@ -292,7 +433,7 @@ def ask_plexi(question, model=None, reasoning=None, config=None, debug=False, he
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             html_path = os.path.join(debug_dir, f"{timestamp}_{label}.html")
             with open(html_path, "w", encoding="utf-8") as f:
-                f.write(driver.page_source)
+                f.write(_page_html(driver))
             logging.error(f"HTML dumped to: {html_path}")
         except Exception as e:
             logging.error(f"Failed to dump HTML: {e}")
@@ -315,18 +456,25 @@ def ask_plexi(question, model=None, reasoning=None, config=None, debug=False, he
         
         while time.time() - start_time < input_timeout:
             try:
-                question_input = driver.find_element(By.CSS_SELECTOR, input_selector)
+                # find_elements returns [] on a miss instead of raising NoSuchElementException
+                matches = driver.find_elements(By.CSS_SELECTOR, input_selector)
+                question_input = matches[0] if matches else None
                 if question_input and question_input.is_displayed():
-                    # Wait for it to be interactable
+                    # Wait for it to be interactable, within what's left of input_timeout
+                    # rather than a second, longer element_wait_timeout wait
+                    remaining = input_timeout - (time.time() - start_time)
                     try:
-                        wait.until(EC.element_to_be_clickable((By.CSS_SELECTOR, input_selector)))
+                        WebDriverWait(driver, max(remaining, 0.1), poll_frequency=0.1).until(
+                            EC.element_to_be_clickable((By.CSS_SELECTOR, input_selector))
+                        )
                     except StaleElementReferenceException:
                         question_input = None
                         continue
+                    except TimeoutException:
+                        question_input = None
                     break
-            except (NoSuchElementException, StaleElementReferenceException):
+            except StaleElementReferenceException:
                 question_input = None
-                pass
             time.sleep(0.5)
         
         if not question_input:
@@ -395,11 +543,12 @@ def ask_plexi(question, model=None, reasoning=None, config=None, debug=False, he
                 if debug:
                     logging.debug(f"send_keys failed: {e}")
         
-        if not current_text or len(current_text.strip()) < len(question) * 0.5:
+        if use_system_clipboard and (not current_text or len(current_text.strip()) < len(question) * 0.5):
             if debug:
                 logging.debug("Both methods failed, trying clipboard paste...")
             # Method 3: Clipboard paste (may not work in headless)
             try:
+                import pyperclip
                 pyperclip.copy(question)
                 question_input.send_keys(Keys.CONTROL + "a")
                 time.sleep(0.1)
@@ -505,7 +654,7 @@ def ask_plexi(question, model=None, reasoning=None, config=None, debug=False, he
         
         # Wait for stop button to appear (indicates generation started)
         try:
-            stop_button = WebDriverWait(driver, 10).until(
+            stop_button = WebDriverWait(driver, 10, poll_frequency=0.1).until(
                 EC.presence_of_element_located((
                     By.CSS_SELECTOR,
                     "button[data-testid='stop-generating-response-button']"
@@ -528,119 +677,59 @@ def ask_plexi(question, model=None, reasoning=None, config=None, debug=False, he
         
         def _debug_element_state():
             """Collect detailed debug info about element states"""
-            state = {
-                'stop_button': {'found': False, 'visible': False},
-                'submit_button': {'found': False, 'disabled': False, 'disabled_attr': None},
-                'copy_button': {'found': False, 'visible': False},
-                'current_url': driver.current_url,
-                'page_title': driver.title,
-            }
-            
-            # Check stop button
-            try:
-                stop_btn = driver.find_element(By.CSS_SELECTOR, "button[data-testid='stop-generating-response-button']")
-                state['stop_button']['found'] = True
-                state['stop_button']['visible'] = stop_btn.is_displayed()
-            except NoSuchElementException:
-                pass
-            
-            # Check submit button
             try:
-                submit_btn = driver.find_element(By.CSS_SELECTOR, "button[data-testid='submit-button']")
-                state['submit_button']['found'] = True
-                disabled_attr = submit_btn.get_attribute("disabled")
-                state['submit_button']['disabled_attr'] = disabled_attr
-                state['submit_button']['disabled'] = (disabled_attr is not None and disabled_attr != "false")
-                state['submit_button']['visible'] = submit_btn.is_displayed()
-            except NoSuchElementException:
-                pass
-            
-            # Check copy button
-            try:
-                copy_btn = driver.find_element(By.CSS_SELECTOR, "button[aria-label='Copy']")
-                state['copy_button']['found'] = True
-                state['copy_button']['visible'] = copy_btn.is_displayed()
-            except NoSuchElementException:
-                pass
-            
-            return state
+                page = _read_completion_state(driver)
+            except Exception as e:
+                log_with_timing(f"Could not read element state: {e}", 'debug')
+                page = {}
+            return {
+                'stop_button': {'found': page.get('stopFound', False), 'visible': page.get('stopVisible', False)},
+                'submit_button': {
+                    'found': page.get('submitFound', False),
+                    'disabled': page.get('submitDisabled', False),
+                    'visible': page.get('submitVisible', False),
+                },
+                'copy_button': {'found': page.get('copyFound', False), 'visible': page.get('copyVisible', False)},
+                # Same snapshot as the buttons, so no separate current_url/title round-trips
+                'current_url': page.get('url'),
+                'page_title': page.get('title'),
+            }
         
         while time.time() - response_wait_start < response_wait_timeout:
-            # Check if still generating (stop button visible)
-            stop_button_visible = False
+            # One script call reads every indicator for this tick
             try:
-                stop_button = driver.find_element(
-                    By.CSS_SELECTOR,
-                    "button[data-testid='stop-generating-response-button']"
-                )
-                if stop_button.is_displayed():
-                    stop_button_visible = True
-            except NoSuchElementException:
-                stop_button_visible = False
+                page = _read_completion_state(driver)
+            except Exception as e:
+                if debug:
+                    log_with_timing(f"Error reading completion state: {e}", 'debug')
+                page = {}
             
             # If stop button is gone, check for completion indicators
-            if not stop_button_visible:
-                # Check for BOTH completion indicators
-                submit_button_disabled = False
-                copy_button_available = False
-                
+            if not page.get('stopVisible'):
                 # Check 1: Submit button with disabled attribute
-                try:
-                    submit_button = driver.find_element(
-                        By.CSS_SELECTOR,
-                        "button[data-testid='submit-button']"
-                    )
-                    disabled_attr = submit_button.get_attribute("disabled")
-                    if disabled_attr is not None and disabled_attr != "false":
-                        submit_button_disabled = True
-                    if debug:
-                        log_with_timing(f"Submit button found: disabled_attr='{disabled_attr}', is_displayed={submit_button.is_displayed()}", 'debug')
-                except NoSuchElementException:
-                    if debug:
+                submit_button_disabled = page.get('submitDisabled', False)
+                if debug:
+                    if page.get('submitFound'):
+                        log_with_timing(f"Submit button found: disabled={submit_button_disabled}, is_displayed={page.get('submitVisible')}", 'debug')
+                    else:
                         log_with_timing("Submit button not found", 'debug')
                 
                 # Check 2: Copy button is available
-                try:
-                    copy_button = driver.find_element(
-                        By.CSS_SELECTOR,
-                        "button[aria-label='Copy']"
-                    )
-                    if copy_button.is_displayed():
-                        copy_button_available = True
-                    if debug:
-                        log_with_timing(f"Copy button found: is_displayed={copy_button.is_displayed()}", 'debug')
-                except NoSuchElementException:
-                    if debug:
+                copy_button_available = page.get('copyVisible', False)
+                if debug:
+                    if page.get('copyFound'):
+                        log_with_timing(f"Copy button found: is_displayed={copy_button_available}", 'debug')
+                    else:
                         log_with_timing("Copy button not found", 'debug')
                 
                 # Check 3: Markdown content has actual text (fallback for headless mode)
-                markdown_content_available = False
-                markdown_text_length = 0
-                try:
-                    # Try multiple selectors for markdown content
-                    markdown_selectors = [
-                        "div[id^='markdown-content']",
-                        "div[id*='markdown-content']",
-                        "div.markdown-content",
-                        "[id*='markdown']"
-                    ]
-                    for selector in markdown_selectors:
-                        try:
-                            markdown_elem = driver.find_element(By.CSS_SELECTOR, selector)
-                            markdown_text = markdown_elem.text.strip()
-                            markdown_text_length = len(markdown_text)
-                            if markdown_text_length >= 10:  # At least 10 characters
-                                markdown_content_available = True
-                                if debug:
-                                    log_with_timing(f"Markdown content found via '{selector}': {markdown_text_length} chars", 'debug')
-                                break
-                        except NoSuchElementException:
-                            continue
-                    if not markdown_content_available and debug:
+                markdown_text_length = page.get('markdownLength', 0)
+                markdown_content_available = markdown_text_length >= 10  # At least 10 characters
+                if debug:
+                    if markdown_content_available:
+                        log_with_timing(f"Markdown content found via '{page.get('markdownSelector')}': {markdown_text_length} chars", 'debug')
+                    else:
                         log_with_timing(f"Markdown content not found or empty (length: {markdown_text_length})", 'debug')
-                except Exception as e:
-                    if debug:
-                        log_with_timing(f"Error checking markdown content: {e}", 'debug')
                 
                 # Completion conditions (in order of preference):
                 # 1. Submit disabled + Copy button available (best indicator)
@@ -724,28 +813,8 @@ def ask_plexi(question, model=None, reasoning=None, config=None, debug=False, he
         
         # Method 1: Navigator Clipboard API (new method, headless-compatible)
         try:
-            # Find all copy buttons and select the bottom-most one
-            copy_buttons = driver.find_elements(By.CSS_SELECTOR, "button[aria-label='Copy']")
-            if not copy_buttons:
-                raise Exception("Copy button not found")
-            
-            # Find the bottom-most copy button by checking Y position
-            visible_buttons = []
-            for btn in copy_buttons:
-                try:
-                    if btn.is_displayed():
-                        y_pos = btn.location['y']
-                        visible_buttons.append((y_pos, btn))
-                except Exception:
-                    continue
-            
-            if not visible_buttons:
-                # Fallback: use the last one in DOM order
-                copy_button = copy_buttons[-1]
-            else:
-                # Sort by Y position (bottom-most has highest Y)
-                visible_buttons.sort(key=lambda x: x[0], reverse=True)
-                copy_button = visible_buttons[0][1]
+            # Select the bottom-most copy button
+            copy_button = _find_bottom_copy_button(driver)
             
             # Use JavaScript click to bypass element interception
             driver.execute_script("arguments[0].click();", copy_button)
@@ -793,12 +862,10 @@ def ask_plexi(question, model=None, reasoning=None, config=None, debug=False, he
                     "div[class*='prose']",
                 ]
                 for selector in selectors:
-                    try:
-                        markdown_element = driver.find_element(By.CSS_SELECTOR, selector)
-                        if markdown_element:
-                            break
-                    except NoSuchElementException:
-                        continue
+                    matches = driver.find_elements(By.CSS_SELECTOR, selector)
+                    if matches:
+                        markdown_element = matches[0]
+                        break
                 
                 if markdown_element:
                     # Get text directly from markdown element
@@ -895,30 +962,12 @@ def ask_plexi(question, model=None, reasoning=None, config=None, debug=False, he
                     log_with_timing(f"Body text extraction failed: {e}", 'debug')
         
         # Method 4: Old click-to-copy method (fallback using pyperclip)
-        if not response_text or len(response_text.strip()) < 10:
+        if use_system_clipboard and (not response_text or len(response_text.strip()) < 10):
             try:
-                # Find all copy buttons and select the bottom-most one
-                copy_buttons = driver.find_elements(By.CSS_SELECTOR, "button[aria-label='Copy']")
-                if not copy_buttons:
-                    raise Exception("Copy button not found")
-                
-                # Find the bottom-most copy button by checking Y position
-                visible_buttons = []
-                for btn in copy_buttons:
-                    try:
-                        if btn.is_displayed():
-                            y_pos = btn.location['y']
-                            visible_buttons.append((y_pos, btn))
-                    except Exception:
-                        continue
-                
-                if not visible_buttons:
-                    # Fallback: use the last one in DOM order
-                    copy_button = copy_buttons[-1]
-                else:
-                    # Sort by Y position (bottom-most has highest Y)
-                    visible_buttons.sort(key=lambda x: x[0], reverse=True)
-                    copy_button = visible_buttons[0][1]
+                import pyperclip
+
+                # Select the bottom-most copy button
+                copy_button = _find_bottom_copy_button(driver)
                 
                 # Use JavaScript click to bypass element interception
                 driver.execute_script("arguments[0].click();", copy_button)
@@ -978,7 +1027,7 @@ def ask_plexi(question, model=None, reasoning=None, config=None, debug=False, he
         raise
 
 
-def ask_in_session(question, session_url, model=None, reasoning=None, config=None, debug=False):
+def ask_in_session(question, session_url, model=None, reasoning=None, config=None, debug=False, browser_manager=None):
     """
     Ask a follow-up question in an existing Perplexity.ai session
     
@@ -989,6 +1038,7 @@ def ask_in_session(question, session_url, model=None, reasoning=None, config=Non
         reasoning (bool, optional): Enable reasoning mode (default: True)
         config: Configuration object. If None, loads from config.json
         debug (bool): Enable debug logging (default: False)
+        browser_manager (BrowserManager, optional): Browser to run on (default: module-level browser)
     
     Returns:
         Tuple[str, Optional[str], str]: (response_text, session_id, final_url)
@@ -1035,7 +1085,7 @@ def ask_in_session(question, session_url, model=None, reasoning=None, config=Non
             reasoning = True
     
     # Ensure browser is started (skip login check - we're already logged in from startup)
-    driver = _ensure_browser_started(config)
+    driver = _ensure_browser_started(config, browser_manager)
     
     # Navigate to session URL if not already there (no sleep - page is usually ready)
     if driver.current_url != session_url:
@@ -1044,7 +1094,7 @@ def ask_in_session(question, session_url, model=None, reasoning=None, config=Non
         time.sleep(0.5)  # Minimal wait for navigation
     
     element_wait_timeout = config.get('perplexity', 'element_wait_timeout') or 10
-    wait = WebDriverWait(driver, element_wait_timeout)
+    wait = WebDriverWait(driver, element_wait_timeout, poll_frequency=0.1)
     
     session_id = _extract_session_id_from_url(session_url)
     final_url = session_url
@@ -1107,7 +1157,7 @@ def ask_in_session(question, session_url, model=None, reasoning=None, config=Non
         
         # Wait for stop button to appear
         try:
-            stop_button = WebDriverWait(driver, 10).until(
+            stop_button = WebDriverWait(driver, 10, poll_frequency=0.1).until(
                 EC.presence_of_element_located((
                     By.CSS_SELECTOR,
                     "button[data-testid='stop-generating-response-button']"
@@ -1119,39 +1169,15 @@ def ask_in_session(question, session_url, model=None, reasoning=None, config=Non
         
         # Wait for completion
         while time.time() - response_wait_start < response_wait_timeout:
-            stop_button_visible = False
             try:
-                stop_button = driver.find_element(
-                    By.CSS_SELECTOR,
-                    "button[data-testid='stop-generating-response-button']"
-                )
-                if stop_button.is_displayed():
-                    stop_button_visible = True
-            except NoSuchElementException:
-                stop_button_visible = False
+                # Use the last (bottom-most) copy button
+                page = _read_completion_state(driver, last_copy=True)
+            except Exception:
+                page = {}
             
-            if not stop_button_visible:
-                submit_button_disabled = False
-                copy_button_available = False
-                
-                try:
-                    submit_btn = driver.find_element(By.CSS_SELECTOR, "button[data-testid='submit-button']")
-                    disabled_attr = submit_btn.get_attribute("disabled")
-                    if disabled_attr is not None and disabled_attr != "false":
-                        submit_button_disabled = True
-                except NoSuchElementException:
-                    pass
-                
-                try:
-                    # Find all copy buttons and use the bottom-most one
-                    copy_buttons = driver.find_elements(By.CSS_SELECTOR, "button[aria-label='Copy']")
-                    if copy_buttons:
-                        # Use the last (bottom-most) copy button
-                        copy_btn = copy_buttons[-1]
-                        if copy_btn.is_displayed():
-                            copy_button_available = True
-                except NoSuchElementException:
-                    pass
+            if not page.get('stopVisible'):
+                submit_button_disabled = page.get('submitDisabled', False)
+                copy_button_available = page.get('copyVisible', False)
                 
                 if submit_button_disabled and copy_button_available:
                     response_content_found = True
@@ -1165,28 +1191,7 @@ def ask_in_session(question, session_url, model=None, reasoning=None, config=Non
         
         # Extract response using bottom-most copy button
         log_with_timing("Extracting response...")
-        copy_buttons = driver.find_elements(By.CSS_SELECTOR, "button[aria-label='Copy']")
-        if not copy_buttons:
-            raise Exception("Copy button not found")
-        
-        # Find the bottom-most copy button by checking Y position
-        # Get all visible copy buttons with their Y positions
-        visible_buttons = []
-        for btn in copy_buttons:
-            try:
-                if btn.is_displayed():
-                    y_pos = btn.location['y']
-                    visible_buttons.append((y_pos, btn))
-            except Exception:
-                continue
-        
-        if not visible_buttons:
-            # Fallback: use the last one in DOM order
-            copy_button = copy_buttons[-1]
-        else:
-            # Sort by Y position (bottom-most has highest Y)
-            visible_buttons.sort(key=lambda x: x[0], reverse=True)
-            copy_button = visible_buttons[0][1]
+        copy_button = _find_bottom_copy_button(driver)
         
         # Use JavaScript click to bypass element interception (input field container can overlay the button)
         driver.execute_script("arguments[0].click();", copy_button)
@@ -0,0 +1,163 @@
+"""
+Browser pool for the Perplexity.ai API server
+Keeps pre-warmed browsers around so requests don't pay Chromium startup
+"""
+import concurrent.futures
+import logging
+import queue
+import threading
+from typing import Dict, List, Optional
+
+from .browser import BrowserManager
+from .config import get_default_user_data_dir
+
+# How long close() waits for in-flight background relaunches before giving up on them
+_CLOSE_RELAUNCH_TIMEOUT = 30
+
+
+class BrowserPool:
+    """Bounded pool of BrowserManager instances, each with its own browser profile"""
+
+    def __init__(self, config, size: int = 1, max_uses: int = 0):
+        """
+        Initialize the browser pool
+
+        Managers are created up front but only become available once they are
+        handed to mark_ready(), so callers can warm them up first.
+
+        Args:
+            config: Configuration object
+            size: Number of browsers in the pool (default: 1)
+            max_uses: Restart a browser after this many requests (0 disables recycling)
+        """
+        self.config = config
+        self.size = max(1, int(size))
+        self.max_uses = max(0, int(max_uses))
+        self.ready_count = 0
+        self._idle: "queue.Queue[BrowserManager]" = queue.Queue()
+        # Recycled managers whose browser is relaunching; they rejoin _idle once it is up
+        self._relaunching: Dict[concurrent.futures.Future, BrowserManager] = {}
+        self._lock = threading.Lock()
+        self._closed = False
+
+        # The first browser keeps the configured profile; the others get siblings
+        # so they don't fight over Chromium's profile lock
+        base_dir = config.get('browser', 'user_data_dir') or get_default_user_data_dir()
+        self.managers: List[BrowserManager] = []
+        for index in range(self.size):
+            user_data_dir = base_dir if index == 0 else f"{base_dir}-pool-{index}"
+            self.managers.append(BrowserManager(config, user_data_dir=user_data_dir))
+
+    def mark_ready(self, manager: BrowserManager):
+        """Make a (warmed-up) manager available to checkout()"""
+        self.ready_count += 1
+        self._idle.put(manager)
+
+    @property
+    def idle_count(self) -> int:
+        """Number of browsers currently waiting for a request"""
+        return self._idle.qsize()
+
+    def login_state(self, max_age: float) -> Optional[bool]:
+        """
+        Summarize the pooled browsers' recent login verdicts without touching any browser
+
+        Args:
+            max_age: Ignore verdicts older than this many seconds
+
+        Returns:
+            False if any browser recently found itself logged out, True if one recently
+            found itself logged in, None if there is no recent verdict
+        """
+        verdicts = [manager.last_login_state(max_age) for manager in self.managers]
+        if False in verdicts:
+            return False
+        if True in verdicts:
+            return True
+        return None
+
+    def checkout(self, timeout: Optional[float] = None) -> BrowserManager:
+        """
+        Take an idle browser manager out of the pool
+
+        Args:
+            timeout: Seconds to wait for an idle browser (None waits forever, 0 fails immediately)
+
+        Raises:
+            queue.Empty: If no browser became idle within the timeout
+        """
+        return self._idle.get(timeout=timeout)
+
+    def release(self, manager: BrowserManager, failed: bool = False, count_use: bool = True):
+        """
+        Return a manager to the pool, recycling its browser when it is worn out
+
+        Args:
+            manager: Manager previously returned by checkout()
+            failed: True if the request using it raised an exception
+            count_use: False for bookkeeping checkouts (e.g. health checks)
+        """
+        if count_use:
+            manager.use_count += 1
+        if failed or (self.max_uses and manager.use_count >= self.max_uses):
+            reason = "request failed" if failed else f"served {manager.use_count} requests"
+            logging.info(f"Recycling browser ({reason})")
+            try:
+                manager.close()
+            except Exception as e:
+                logging.warning(f"Failed to close recycled browser: {e}")
+            manager.use_count = 0
+            # Relaunch right away so the next request doesn't pay Chrome's cold start;
+            # visible browsers still restart lazily on next use
+            if self.config.get('browser', 'headless'):
+                with self._lock:
+                    relaunch = not self._closed
+                    if relaunch:
+                        future = manager.start_headless_browser_async()
+                        self._relaunching[future] = manager
+                # Outside the lock: the callback runs right away if the launch already finished
+                if relaunch:
+                    future.add_done_callback(self._relaunch_done)
+                    return
+        self._idle.put(manager)
+
+    def _relaunch_done(self, future: concurrent.futures.Future):
+        """Return a relaunched manager to the pool, or close it if the pool shut down meanwhile"""
+        with self._lock:
+            manager = self._relaunching.pop(future)
+            closed = self._closed
+        try:
+            # Collect the outcome so a failed launch isn't re-raised to the next request,
+            # which starts the browser again on demand instead
+            manager.wait_until_started(timeout=0)
+        except Exception as e:
+            if not closed:
+                logging.warning(f"Background relaunch of recycled browser failed: {e}")
+        if closed:
+            try:
+                manager.close()
+            except Exception as e:
+                logging.debug(f"Failed to close relaunched browser: {e}")
+            return
+        self._idle.put(manager)
+
+    def close(self):
+        """Close every browser in the pool, waiting for background relaunches first"""
+        with self._lock:
+            self._closed = True
+            pending = dict(self._relaunching)
+        # Relaunching managers are closed by _relaunch_done once their launch finishes
+        # (or is cancelled); wait for that so no Chrome outlives the pool
+        for future in pending:
+            future.cancel()
+        _, still_running = concurrent.futures.wait(pending, timeout=_CLOSE_RELAUNCH_TIMEOUT)
+        if still_running:
+            logging.warning(f"{len(still_running)} browser relaunch(es) still running at shutdown")
+        relaunching = {id(manager) for manager in pending.values()}
+        for manager in self.managers:
+            if id(manager) in relaunching:
+                continue
+            try:
+                manager.close()
+            except Exception as e:
+                logging.debug(f"Failed to close pooled browser: {e}")
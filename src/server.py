@@ -1,26 +1,34 @@
 """
 Lightweight HTTP server for Perplexity.ai API
 Handles single endpoint: POST /ask
+Requests are served on threads; concurrency is bounded by the browser pool
 """
 import json
 import logging
+import queue
 import re
+import socket
 import threading
 import time
-from http.server import HTTPServer, BaseHTTPRequestHandler
-from typing import Optional
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from typing import TYPE_CHECKING, Optional
+from urllib.parse import urlparse
 
-from .perplexity import ask_plexi, ask_in_session, close_browser
-from .perplexity import _ensure_browser_started, _ensure_logged_in
 from .session_manager import SessionManager
 from .config import load_config
+from .logging_setup import configure_logging
 from .systemd_notify import SdNotifier
 
+# Browser automation modules pull in Selenium; they are imported where used
+# so `perplexity-server --help` stays fast
+if TYPE_CHECKING:
+    from .pool import BrowserPool
+
 
 logger = logging.getLogger(__name__)
 
-# Global request lock for handling one request at a time
-_request_lock = threading.Lock()
+# Global browser pool; each request checks out one browser
+_pool: Optional["BrowserPool"] = None
 
 # Global session manager
 _session_manager: Optional[SessionManager] = None
@@ -28,6 +36,13 @@ _session_manager: Optional[SessionManager] = None
 # Global config
 _config = None
 
+# How often the login cookie is checked, and how close to expiry it gets refreshed
+_COOKIE_CHECK_INTERVAL_SECONDS = 24 * 3600
+_COOKIE_REFRESH_THRESHOLD_SECONDS = 3 * 24 * 3600
+
+# How long a login verdict from a request, warm-up or cookie check is reported by /health
+_HEALTH_LOGIN_TTL_SECONDS = 600
+
 # Systemd notifier
 _notifier: Optional[SdNotifier] = None
 def _set_status(message: str) -> None:
@@ -111,6 +126,54 @@ def clean_response_text(text, include_sources=True):
     return result.strip()
 
 
+def _prime_dns(url: str) -> None:
+    """Resolve the Perplexity host once so browsers starting afterwards hit a warm resolver cache."""
+    hostname = urlparse(url).hostname
+    if not hostname:
+        return
+    start = time.time()
+    try:
+        socket.getaddrinfo(hostname, 443, type=socket.SOCK_STREAM)
+        logger.debug(f"Resolved {hostname} in {int((time.time() - start) * 1000)}ms")
+    except OSError as e:
+        logger.debug(f"DNS pre-resolution for {hostname} failed: {e}")
+
+
+def _refresh_login_cookies(manager) -> None:
+    """Reload the page if the session cookie is about to expire and persist the current cookies."""
+    if manager.driver is None:
+        return
+    
+    expiry = manager.session_cookie_expiry()
+    if expiry is not None and expiry - time.time() < _COOKIE_REFRESH_THRESHOLD_SECONDS:
+        days_left = (expiry - time.time()) / 86400
+        logger.info(f"Login cookie expires in {days_left:.1f} days; reloading Perplexity to renew it")
+        manager.refresh_page()
+    
+    if manager.check_login():
+        manager.save_cookies()
+    else:
+        logger.warning("Browser is no longer logged in; run 'askplexi --manual-login'")
+        _set_status("Login expired – manual login required")
+
+
+def _cookie_watcher(pool) -> None:
+    """Periodically renew and persist login cookies using an idle pooled browser."""
+    while True:
+        time.sleep(_COOKIE_CHECK_INTERVAL_SECONDS)
+        try:
+            manager = pool.checkout(timeout=60)
+        except queue.Empty:
+            logger.debug("No idle browser for the cookie check; trying again later")
+            continue
+        try:
+            _refresh_login_cookies(manager)
+        except Exception as e:
+            logger.warning(f"Cookie refresh failed: {e}")
+        finally:
+            pool.release(manager, count_use=False)
+
+
 class PerplexityAPIHandler(BaseHTTPRequestHandler):
     """HTTP request handler for Perplexity API"""
     
@@ -129,83 +192,36 @@ class PerplexityAPIHandler(BaseHTTPRequestHandler):
     def do_GET(self):
         """Handle GET requests for health checks"""
         if self.path == '/health' or self.path == '/':
-            # Check browser state
+            # Report from pool bookkeeping and cached login verdicts only: checking a
+            # browser out here would turn away a request that arrives during the poll
             status = 'ok'
             message = 'Ready'
             http_status = 200
+            idle = 0
+            logged_in = None
             
-            try:
-                from .perplexity import _browser_driver, _browser_manager, _get_browser_manager
-                from .config import load_config
-                
-                # Check if browser is initialized
-                if _browser_driver is None or _browser_manager is None:
-                    status = 'not_ready'
-                    message = 'Browser not yet initialized'
-                    http_status = 503
-                else:
-                    # Check if browser session is valid
-                    try:
-                        _browser_driver.current_url
-                    except Exception:
-                        status = 'not_ready'
-                        message = 'Browser session invalid'
-                        http_status = 503
-                    
-                    # Check for Cloudflare
-                    if status == 'ok':
-                        try:
-                            manager = _get_browser_manager(_config if _config else load_config())
-                            if manager._check_cloudflare_challenge():
-                                status = 'blocked'
-                                message = 'Cloudflare challenge blocking access'
-                                _set_status("Blocked by Cloudflare challenge – manual login required")
-                                http_status = 503
-                        except Exception as e:
-                            logger.debug(f"Cloudflare check failed: {e}")
-                    
-                    # Check login status
-                    if status == 'ok':
-                        try:
-                            manager = _get_browser_manager(_config if _config else load_config())
-                            if not manager.check_login():
-                                status = 'not_logged_in'
-                                message = 'User not logged in'
-                                http_status = 503
-                        except Exception as e:
-                            logger.debug(f"Login check failed: {e}")
-                            status = 'not_ready'
-                            message = f'Login check failed: {e}'
-                            _set_status(f"Login check failed: {e}")
-                            http_status = 503
-                    
-                    # Check if ready for questions (input field available)
-                    if status == 'ok':
-                        try:
-                            from selenium.webdriver.common.by import By
-                            question_input = _browser_driver.find_elements(By.CSS_SELECTOR, "p[dir='auto']")
-                            if not question_input or not any(inp.is_displayed() for inp in question_input):
-                                status = 'not_ready'
-                                message = 'Input field not ready'
-                                http_status = 503
-                        except Exception as e:
-                            logger.debug(f"Input field check failed: {e}")
-                            status = 'not_ready'
-                            message = f'Input field check failed: {e}'
-                            _set_status("Input field not ready – waiting for Perplexity UI")
-                            http_status = 503
-                            
-            except Exception as e:
-                logger.error(f"Health check error: {e}", exc_info=True)
-                status = 'error'
-                message = f'Health check failed: {e}'
-                _set_status(f"Health check error: {e}")
+            if _pool is None or _pool.ready_count == 0:
+                status = 'not_ready'
+                message = 'Browser not yet initialized'
                 http_status = 503
+            else:
+                idle = _pool.idle_count
+                logged_in = _pool.login_state(max_age=_HEALTH_LOGIN_TTL_SECONDS)
+                if logged_in is False:
+                    status = 'not_logged_in'
+                    message = 'User not logged in'
+                    http_status = 503
+                elif idle == 0:
+                    # Every browser is serving a request, which is healthy
+                    message = 'All browsers are busy processing requests'
             
             data = {
                 'status': status,
                 'service': 'perplexity-api',
                 'message': message,
+                'busy': http_status == 200 and idle == 0,
+                'idle_browsers': idle,
+                'logged_in': logged_in,
             }
             
             if http_status == 200:
@@ -221,19 +237,25 @@ class PerplexityAPIHandler(BaseHTTPRequestHandler):
     
     def do_POST(self):
         """Handle POST requests"""
-        global _request_lock, _session_manager, _config
+        global _session_manager, _config
+        from .perplexity import ask_plexi, ask_in_session
         
         # Only handle /ask endpoint
         if self.path != '/ask':
             self._send_error_response(404, "Not Found", "Only /ask endpoint is supported")
             return
         
-        # Handle one request at a time
-        if not _request_lock.acquire(blocking=False):
+        # Each request needs an idle browser from the pool
+        try:
+            if _pool is None:
+                raise queue.Empty
+            manager = _pool.checkout(timeout=0)
+        except queue.Empty:
             self._send_error_response(503, "Service Unavailable", "Server is busy processing another request")
             _set_status("Busy – already processing another request")
             return
         
+        failed = False
         try:
             # Parse request body
             content_length = int(self.headers.get('Content-Length', 0))
@@ -280,7 +302,8 @@ class PerplexityAPIHandler(BaseHTTPRequestHandler):
                         question,
                         session_url,
                         config=_config,
-                        debug=False
+                        debug=False,
+                        browser_manager=manager,
                     )
                     session_id = session_id or session_id_override
                     _session_manager.update_session_usage(session_id_override)
@@ -299,7 +322,9 @@ class PerplexityAPIHandler(BaseHTTPRequestHandler):
                     question,
                     config=_config,
                     debug=False,
-                    headless=True
+                    headless=True,
+                    browser_manager=manager,
+                    use_system_clipboard=False,
                 )
                 
                 if session_id and final_url:
@@ -317,6 +342,7 @@ class PerplexityAPIHandler(BaseHTTPRequestHandler):
             _set_status("Idle – browser ready for questions")
             
         except Exception as e:
+            failed = True
             error_msg = str(e)
             logger.error(f"Error processing request: {e}", exc_info=True)
             _set_status(f"Error while processing request: {error_msg or 'see logs'}")
@@ -331,7 +357,7 @@ class PerplexityAPIHandler(BaseHTTPRequestHandler):
             else:
                 self._send_error_response(500, "Internal Server Error", error_msg)
         finally:
-            _request_lock.release()
+            _pool.release(manager, failed=failed)
     
     def _send_json_response(self, status_code: int, data: dict):
         """Send JSON response"""
@@ -352,15 +378,18 @@ class PerplexityAPIHandler(BaseHTTPRequestHandler):
         self._send_json_response(status_code, response_data)
 
 
-def start_server(host: str = 'localhost', port: int = 8000):
+def start_server(host: str = 'localhost', port: int = 8000, workers: Optional[int] = None):
     """
     Start the Perplexity API server
     
     Args:
         host: Host to bind to (default: localhost)
         port: Port to listen on (default: 8000)
+        workers: Number of pooled browsers / concurrent requests (default: browser.pool_size)
     """
-    global _config, _session_manager
+    global _config, _session_manager, _pool
+    from .perplexity import _ensure_browser_started, _ensure_logged_in, close_browser
+    from .pool import BrowserPool
     
     # Initialize config and session manager
     global _notifier
@@ -369,95 +398,122 @@ def start_server(host: str = 'localhost', port: int = 8000):
 
     _config = load_config()
     _session_manager = SessionManager()
+    _pool = BrowserPool(
+        _config,
+        size=workers or _config.get('browser', 'pool_size') or 1,
+        max_uses=_config.get('browser', 'max_uses_per_browser') or 0,
+    )
     
-    # Initialize browser at startup - navigate to main page (non-blocking)
-    # Start HTTP server first, then initialize browser in background
-    logger.info("Starting browser initialization (non-blocking)...")
+    # Initialize browsers at startup - navigate to main page (non-blocking)
+    # Start HTTP server first, then initialize browsers in background
+    logger.info(f"Starting initialization of {_pool.size} browser(s) (non-blocking)...")
 
     browser_ready_event = threading.Event()
 
-    def init_browser():
+    def warm_up_browser(manager):
+        """
+        Start a pooled browser, verify login and wait for the question input
+        
+        Returns:
+            bool: True if the login was verified
+        """
+        _set_status("Starting headless browser session...")
+        driver = _ensure_browser_started(_config, manager)
+        logger.info("Browser started")
+        
+        logged_in = False
+        try:
+            _set_status("Verifying Perplexity login state...")
+            _ensure_logged_in(_config, manager)
+            logged_in = True
+            logger.info("Login verified")
+        except Exception as e:
+            logger.warning(f"Login check failed: {e}")
+            logger.warning("Login can be completed on first request")
+        
+        # Login may have restarted the browser
+        driver = manager.driver or driver
+        
+        # Navigate to main Perplexity page and wait for input to be ready
+        perplexity_url = _config.get('browser', 'perplexity_url')
+        base_url = perplexity_url.split('?')[0]  # Remove query params
+        if driver.current_url != base_url and base_url not in driver.current_url:
+            logger.info(f"Navigating to main page: {base_url}")
+            driver.get(base_url)
+        
+        # Wait for input field to be ready (this is the slow part, do it at startup)
+        _set_status("Waiting for Perplexity input field to become ready...")
+        logger.info("Waiting for input field to be ready...")
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support.ui import WebDriverWait
+        from selenium.webdriver.support import expected_conditions as EC
+        
+        wait = WebDriverWait(driver, 30, poll_frequency=0.1)
+        try:
+            wait.until(
+                EC.presence_of_element_located((By.CSS_SELECTOR, "p[dir='auto']"))
+            )
+            wait.until(EC.element_to_be_clickable((By.CSS_SELECTOR, "p[dir='auto']")))
+            logger.info("✓ Browser initialized and ready - input field available")
+            _set_status("Idle – browser ready for questions")
+        except Exception as e:
+            logger.warning(f"Input field not ready yet: {e}")
+            logger.info("Browser initialized (input will be ready on first request)")
+            _set_status("Browser initialized; waiting for first request to finish setup")
+        return logged_in
+
+    def init_browsers():
         retry_delay = 15
-        while True:
-            try:
-                _set_status("Starting headless browser session...")
-                driver = _ensure_browser_started(_config)
-                logger.info("Browser started")
-                
+        _prime_dns(_config.get('browser', 'perplexity_url') or "https://www.perplexity.ai/")
+        headless = _config.get('browser', 'headless')
+        # Only the primary browser launches up front: the others restore their
+        # session from cookies.json, which is written once its login is verified
+        if headless:
+            _pool.managers[0].start_headless_browser_async()
+        for index, manager in enumerate(_pool.managers):
+            while True:
                 try:
-                    _set_status("Verifying Perplexity login state...")
-                    _ensure_logged_in(_config)
-                    logger.info("Login verified")
-                except Exception as e:
-                    logger.warning(f"Login check failed: {e}")
-                    logger.warning("Login can be completed on first request")
-                
-                # Navigate to main Perplexity page and wait for input to be ready
-                perplexity_url = _config.get('browser', 'perplexity_url')
-                base_url = perplexity_url.split('?')[0]  # Remove query params
-                if driver.current_url != base_url and base_url not in driver.current_url:
-                    logger.info(f"Navigating to main page: {base_url}")
-                    driver.get(base_url)
-                
-                # Wait for input field to be ready (this is the slow part, do it at startup)
-                _set_status("Waiting for Perplexity input field to become ready...")
-                logger.info("Waiting for input field to be ready...")
-                from selenium.webdriver.common.by import By
-                from selenium.webdriver.support.ui import WebDriverWait
-                from selenium.webdriver.support import expected_conditions as EC
-                
-                wait = WebDriverWait(driver, 30)
-                try:
-                    wait.until(
-                        EC.presence_of_element_located((By.CSS_SELECTOR, "p[dir='auto']"))
-                    )
-                    wait.until(EC.element_to_be_clickable((By.CSS_SELECTOR, "p[dir='auto']")))
-                    logger.info("✓ Browser initialized and ready - input field available")
-                    _set_status("Idle – browser ready for questions")
+                    logged_in = warm_up_browser(manager)
+                    break
                 except Exception as e:
-                    logger.warning(f"Input field not ready yet: {e}")
-                    logger.info("Browser initialized (input will be ready on first request)")
-                    _set_status("Browser initialized; waiting for first request to finish setup")
-                
-                # Once we reached this point, break out of retry loop
-                browser_ready_event.set()
-                break
-            except Exception as e:
-                logger.error(f"Failed to initialize browser: {e}", exc_info=True)
-                logger.warning(f"Retrying browser initialization in {retry_delay}s...")
-                _set_status(f"Browser init failed ({e}); retrying in {retry_delay}s")
-                if _notifier:
-                    _notifier.extend_timeout(retry_delay)
-                time.sleep(retry_delay)
+                    logger.error(f"Failed to initialize browser {index + 1}/{_pool.size}: {e}", exc_info=True)
+                    logger.warning(f"Retrying browser initialization in {retry_delay}s...")
+                    _set_status(f"Browser init failed ({e}); retrying in {retry_delay}s")
+                    if _notifier:
+                        _notifier.extend_timeout(retry_delay)
+                    time.sleep(retry_delay)
+            
+            if index == 0:
+                # Existing installs may predate cookies.json; seed it for the sibling profiles,
+                # then queue their launches so they start while earlier ones warm up
+                if logged_in:
+                    manager.save_cookies()
+                if headless:
+                    for sibling in _pool.managers[1:]:
+                        sibling.start_headless_browser_async()
+            
+            # Once the first browser is usable the server can accept questions
+            _pool.mark_ready(manager)
+            browser_ready_event.set()
+            logger.info(f"Browser {index + 1}/{_pool.size} added to pool")
     
     # Start browser initialization in background thread
-    browser_thread = threading.Thread(target=init_browser, daemon=True)
+    browser_thread = threading.Thread(target=init_browsers, daemon=True)
     browser_thread.start()
+    threading.Thread(target=_cookie_watcher, args=(_pool,), daemon=True).start()
     logger.info("Browser initialization started in background")
     
-    # Wait up to 30 seconds for browser to be ready (or until ready)
-    logger.info("Waiting for browser to initialize (max 30s)...")
-    start_wait = time.time()
+    # Wait up to 30 seconds for the first browser to be ready
     max_wait = 30
-    while time.time() - start_wait < max_wait:
-        try:
-            from .perplexity import _browser_driver
-            if _browser_driver is not None:
-                try:
-                    _browser_driver.current_url
-                    logger.info("Browser is ready")
-                    break
-                except Exception:
-                    pass
-        except Exception:
-            pass
-        time.sleep(1)
+    logger.info(f"Waiting for browser to initialize (max {max_wait}s)...")
+    if browser_ready_event.wait(max_wait):
+        logger.info("Browser is ready")
     else:
         logger.warning(f"Browser not ready after {max_wait}s, continuing anyway")
     
     # Start HTTP server
     server_address = (host, port)
-    httpd = HTTPServer(server_address, PerplexityAPIHandler)
+    httpd = ThreadingHTTPServer(server_address, PerplexityAPIHandler)
 
     def signal_ready_when_browser_ready():
         browser_ready_event.wait()
@@ -475,6 +531,7 @@ def start_server(host: str = 'localhost', port: int = 8000):
     except KeyboardInterrupt:
         logger.info("Shutting down server...")
         httpd.shutdown()
+        _pool.close()
         close_browser()
         logger.info("Server stopped")
 
@@ -496,6 +553,12 @@ def cli_main() -> None:
         default=8000,
         help="Port to listen on (default: 8000)",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Number of browsers serving requests concurrently (default: browser.pool_size from config)",
+    )
     parser.add_argument(
         "--debug",
         action="store_true",
@@ -504,13 +567,9 @@ def cli_main() -> None:
 
     args = parser.parse_args()
 
-    log_level = logging.DEBUG if args.debug else logging.INFO
-    logging.basicConfig(
-        level=log_level,
-        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-    )
+    configure_logging(debug=args.debug)
 
-    start_server(host=args.host, port=args.port)
+    start_server(host=args.host, port=args.port, workers=args.workers)
 
 
 if __name__ == '__main__':
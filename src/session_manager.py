@@ -5,19 +5,11 @@ Uses JSON file for persistent storage
 import json
 import os
 import logging
+import threading
 from datetime import datetime
 from typing import Optional, Dict, Any
 
-
-def get_xdg_config_dir() -> str:
-    """Get XDG config directory: ~/.config/askplexi/"""
-    config_home = os.environ.get("XDG_CONFIG_HOME")
-    if config_home:
-        config_dir = os.path.join(config_home, "askplexi")
-    else:
-        config_dir = os.path.join(os.path.expanduser("~"), ".config", "askplexi")
-    os.makedirs(config_dir, exist_ok=True)
-    return config_dir
+from .config import get_xdg_config_dir
 
 
 class SessionManager:
@@ -35,6 +27,8 @@ class SessionManager:
             sessions_file = os.path.join(config_dir, "sessions.json")
         
         self.sessions_file = sessions_file
+        # Server handlers run on multiple threads and share this manager
+        self._lock = threading.RLock()
         self._data = self._load()
     
     def _load(self) -> Dict[str, Any]:
@@ -57,7 +51,7 @@ class SessionManager:
     def _save(self):
         """Save sessions to JSON file"""
         try:
-            with open(self.sessions_file, 'w') as f:
+            with self._lock, open(self.sessions_file, 'w') as f:
                 json.dump(self._data, f, indent=2)
         except Exception as e:
             logging.error(f"Error saving sessions file: {e}")
@@ -83,33 +77,36 @@ class SessionManager:
         """
         now = datetime.utcnow().isoformat()
         
-        if session_id not in self._data['sessions']:
-            # New session
-            self._data['sessions'][session_id] = {
-                'url': url,
-                'created_at': now,
-                'last_used_at': now
-            }
-            logging.info(f"Created new session: {session_id}")
-        else:
-            # Update existing session
-            self._data['sessions'][session_id]['url'] = url
-            self._data['sessions'][session_id]['last_used_at'] = now
-            logging.info(f"Updated session: {session_id}")
+        with self._lock:
+            if session_id not in self._data['sessions']:
+                # New session
+                self._data['sessions'][session_id] = {
+                    'url': url,
+                    'created_at': now,
+                    'last_used_at': now
+                }
+                logging.info(f"Created new session: {session_id}")
+            else:
+                # Update existing session
+                self._data['sessions'][session_id]['url'] = url
+                self._data['sessions'][session_id]['last_used_at'] = now
+                logging.info(f"Updated session: {session_id}")
         
-        # Set as current session
-        self._data['current_session'] = session_id
-        self._save()
+            # Set as current session
+            self._data['current_session'] = session_id
+            self._save()
     
     def update_session_usage(self, session_id: str):
         """Update last_used_at timestamp for a session"""
-        if session_id in self._data.get('sessions', {}):
-            self._data['sessions'][session_id]['last_used_at'] = datetime.utcnow().isoformat()
-            self._save()
+        with self._lock:
+            if session_id in self._data.get('sessions', {}):
+                self._data['sessions'][session_id]['last_used_at'] = datetime.utcnow().isoformat()
+                self._save()
     
     def get_all_sessions(self) -> Dict[str, Dict[str, Any]]:
         """Get all sessions"""
-        return self._data.get('sessions', {}).copy()
+        with self._lock:
+            return self._data.get('sessions', {}).copy()
     
     def get_session_info(self, session_id: str) -> Optional[Dict[str, Any]]:
         """Get information about a specific session"""